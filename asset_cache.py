@@ -0,0 +1,171 @@
+# Кеш зображень скінів: зменшені копії на диску під потрібний розмір
+# і LRU декодованих текстур у пам'яті з обмеженням за обсягом.
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import threading
+
+from persistence import atomic_write
+
+try:
+    from PIL import Image as PILImage
+except ImportError:  # без Pillow використовуємо оригінальні файли
+    PILImage = None
+    print("Pillow не встановлено: мініатюри скінів вимкнено, зображення декодуються в повному розмірі "
+          "(pip install pillow)")
+
+
+class ThumbnailCache:
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self._index = None
+        self._lock = threading.Lock()  # мініатюри можуть готуватися з кількох потоків
+
+    def _load_index(self):
+        if self._index is None:
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def source_key(self, source):
+        # Хеш вмісту перераховується лише коли змінився mtime або розмір файлу
+        st = os.stat(source)
+        with self._lock:
+            index = self._load_index()
+            entry = index.get(source)
+            if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                return entry[2]
+        with open(source, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()[:16]
+        with self._lock:
+            index[source] = [st.st_mtime_ns, st.st_size, digest]
+            os.makedirs(self.cache_dir, exist_ok=True)
+            atomic_write(self.index_path, json.dumps(index))
+        return digest
+
+    def thumbnail(self, source, width, height):
+        # Повертає шлях до копії розміром width x height пікселів (або оригінал)
+        if PILImage is None or not source or not os.path.exists(source):
+            return source
+        width, height = int(width), int(height)
+        name = os.path.splitext(os.path.basename(source))[0]
+        path = os.path.join(self.cache_dir, f"{name}_{width}x{height}_{self.source_key(source)}.png")
+        if os.path.exists(path):
+            return path
+
+        with PILImage.open(source) as img:
+            if img.width <= width and img.height <= height:
+                return source
+            thumb = img.convert('RGBA').resize((width, height), PILImage.LANCZOS)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        thumb.save(tmp_path, 'PNG')
+        os.replace(tmp_path, path)
+        return path
+
+
+class TextureCache:
+    def __init__(self, budget_bytes=32 * 1024 * 1024, loader=None):
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.loader = loader or self._load_texture
+        self._textures = OrderedDict()  # шлях -> (текстура, байти)
+
+    @staticmethod
+    def decode(path):
+        # Читання і декодування файлу в пікселі без OpenGL - можна викликати у фоновому потоці
+        from kivy.core.image import ImageLoader
+        return ImageLoader.load(path, keep_data=True, nocache=True)
+
+    @staticmethod
+    def upload(image):
+        # Лише Texture.create і копіювання готових пікселів - в UI-потоці
+        return image.texture
+
+    def _load_texture(self, path):
+        return self.upload(self.decode(path))
+
+    def get(self, path):
+        entry = self._textures.get(path)
+        if entry is not None:
+            self._textures.move_to_end(path)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        texture = self.loader(path)
+        self.put(path, texture)
+        return texture
+
+    def put(self, path, texture):
+        old = self._textures.pop(path, None)
+        if old is not None:
+            self.used_bytes -= old[1]
+        size = texture.width * texture.height * 4
+        self._textures[path] = (texture, size)
+        self.used_bytes += size
+        # Найстаріші текстури вивантажуємо, поки не вкладемося в бюджет (остання лишається)
+        while self.used_bytes > self.budget_bytes and len(self._textures) > 1:
+            _, (_, evicted) = self._textures.popitem(last=False)
+            self.used_bytes -= evicted
+
+    def peek(self, path):
+        # Текстура, якщо вона вже в кеші; без завантаження
+        entry = self._textures.get(path)
+        if entry is None:
+            return None
+        self._textures.move_to_end(path)
+        self.hits += 1
+        return entry[0]
+
+    def clear(self):
+        self._textures.clear()
+        self.used_bytes = 0
+
+
+class AssetCache:
+    def __init__(self, cache_dir='.thumbs', budget_bytes=32 * 1024 * 1024):
+        self.thumbnails = ThumbnailCache(cache_dir)
+        self.textures = TextureCache(budget_bytes)
+        self._paths = {}  # (джерело, ширина, висота) -> шлях до копії
+
+    def path(self, source, width, height):
+        key = (source, int(width), int(height))
+        path = self._paths.get(key)
+        if path is None:
+            try:
+                path = self.thumbnails.thumbnail(source, width, height)
+            except OSError as e:
+                print(f"Помилка створення мініатюри {source}: {e}")
+                path = source
+            self._paths[key] = path
+        return path
+
+    def texture(self, source, width, height):
+        return self.textures.get(self.path(source, width, height))
+
+    def decode(self, source, width, height):
+        # Фонова частина завантаження: мініатюра і декодування
+        path = self.path(source, width, height)
+        return path, self.textures.decode(path)
+
+    def add_decoded(self, decoded):
+        # UI-частина: текстура з уже декодованих пікселів (якщо її ще немає в кеші)
+        path, image = decoded
+        texture = self.textures.peek(path)
+        if texture is None:
+            texture = self.textures.upload(image)
+            self.textures.put(path, texture)
+        return texture
+
+    def cached_texture(self, source, width, height):
+        # Лише те, що вже завантажено: ні мініатюр, ні читання файлів
+        path = self._paths.get((source, int(width), int(height)))
+        return self.textures.peek(path) if path is not None else None
@@ -0,0 +1,71 @@
+# Пул голосів для звуку кліку: кілька заздалегідь завантажених копій
+# одного звуку, що відтворюються по колу, з обмеженням звуків на кадр.
+import os
+
+# Нестиснений WAV декодується один раз і грає без затримки; MP3 - запасний варіант
+CLICK_SOUND_FILES = ('click.wav', 'click.mp3')
+
+
+def find_sound(candidates):
+    for path in candidates:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+class VoicePool:
+    def __init__(self, voices, max_per_frame=3, frame_clock=None, volume=1.0):
+        self.voices = [voice for voice in voices if voice]
+        self.max_per_frame = max_per_frame
+        self.frame_clock = frame_clock
+        self.next_voice = 0
+        self.frame = None
+        self.played_this_frame = 0
+        self.played = 0
+        self.dropped = 0
+        self.stolen = 0
+        self.set_volume(volume)
+
+    @classmethod
+    def load(cls, loader, candidates=CLICK_SOUND_FILES, size=4, **kwargs):
+        path = find_sound(candidates)
+        voices = [loader(path) for _ in range(size)] if path else []
+        return cls(voices, **kwargs)
+
+    def __bool__(self):
+        return bool(self.voices)
+
+    def set_volume(self, volume):
+        self.volume = volume
+        for voice in self.voices:
+            voice.volume = volume
+
+    def play(self, count=1):
+        # Відтворює до count голосів, але не більше max_per_frame за кадр
+        if not self.voices:
+            return 0
+        if self.frame_clock is not None:
+            frame = self.frame_clock()
+            if frame != self.frame:
+                self.frame = frame
+                self.played_this_frame = 0
+
+        allowed = min(count, self.max_per_frame - self.played_this_frame)
+        if allowed <= 0:
+            self.dropped += count
+            return 0
+        self.dropped += count - allowed
+
+        voices = self.voices
+        for _ in range(allowed):
+            voice = voices[self.next_voice]
+            self.next_voice = (self.next_voice + 1) % len(voices)
+            if voice.state == 'play':
+                # Найстаріший голос перериваємо замість створення нового
+                voice.stop()
+                self.stolen += 1
+            voice.play()
+
+        self.played_this_frame += allowed
+        self.played += allowed
+        return allowed
@@ -0,0 +1,293 @@
+# Бенчмарки гарячих шляхів: кліки, збереження/завантаження, магазин, зміна скіна.
+#
+#   python bench.py                     # виміряти і порівняти з bench_baseline.json
+#   python bench.py --update-baseline   # записати поточні результати як базові
+#
+# Частина вимірювань працює на чистих об'єктах стану і не потребує Kivy.
+# Решта вимірює сам ClickerApp у невидимому вікні (SDL_VIDEODRIVER=offscreen - драйвер
+# dummy не дає контексту OpenGL), тож дисплей не потрібен. Без Kivy запуск без
+# --state-only завершується помилкою: метрики застосунку є в базі і мають бути виміряні.
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from catalog import SkinCatalog, SkinItem
+from click_pipeline import ClickPipeline
+from game_state import GameEngine, GameState
+from savefile import SaveFile
+from stats import StatsEngine
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+RESULTS_PATH = os.path.join(ROOT, 'bench_results.json')
+BASELINE_PATH = os.path.join(ROOT, 'bench_baseline.json')
+
+SAVE_SIZES = {'small': 4, 'medium': 1000, 'large': 100000}  # кількість скінів у бітовій масці
+SHOP_SIZES = (4, 100, 1000)
+ASSETS = ('item1.png', 'item2.png', 'item3.png', 'item4.png', 'splash.png', 'click.mp3',
+          'upgrades.json', 'catalog.json')
+
+# Для швидкостей більше - краще, для затримок - менше
+HIGHER_IS_BETTER = ('_per_sec',)
+APP_PREFIX = 'app_'  # метрики bench_app
+# Затримка - регресія, лише якщо вона гірша за базу і в tolerance разів, і на стільки мс:
+# менші різниці - шум таймера, а для роботи з файлами - шум файлової системи
+NOISE_FLOOR_MS = 0.05
+IO_METRICS = ('save_', 'load_', 'app_save_', 'app_load_')
+IO_NOISE_FLOOR_MS = 0.5
+
+
+class BenchError(Exception):
+    pass
+
+
+def measure(func, repeat=7, best=False):
+    # Медіана кількох запусків у секундах; best - мінімум (для файлових операцій,
+    # де окремі запуски випадково чекають на диск)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return min(samples) if best else statistics.median(samples)
+
+
+def require(condition, message):
+    # Заміряти шлях, що нічого не робить, гірше, ніж не заміряти зовсім
+    if not condition:
+        raise BenchError(message)
+
+
+def noise_floor(name):
+    return IO_NOISE_FLOOR_MS if name.startswith(IO_METRICS) else NOISE_FLOOR_MS
+
+
+def synthetic_catalog(size):
+    images = ('item1.png', 'item2.png', 'item3.png')
+    items = [SkinItem(i + 1, images[i % len(images)], 1000 * (i + 1), '#ffffff') for i in range(size - 1)]
+    return SkinCatalog(items + [SkinItem(0, 'item4.png', 0, '#f5a742')])
+
+
+def bench_state(workdir):
+    results = {}
+
+    clicks = 200000
+
+    def engine_clicks():
+        engine = GameEngine()
+        for _ in range(clicks):
+            engine.click()
+    results['engine_clicks_per_sec'] = clicks / measure(engine_clicks)
+
+    def pipeline_clicks():
+        engine = GameEngine()
+        pipeline = ClickPipeline(engine.click, schedule=lambda: None)
+        for i in range(clicks):
+            pipeline.push()
+            if i % 10 == 9:  # ~10 кліків на кадр
+                pipeline.flush()
+        pipeline.flush()
+    results['pipeline_clicks_per_sec'] = clicks / measure(pipeline_clicks)
+
+    def stats_clicks():
+        stats = StatsEngine()
+        for i in range(clicks):
+            stats.add_clicks(1, 1, now=i * 0.01)
+    results['stats_clicks_per_sec'] = clicks / measure(stats_clicks)
+
+    for name, skins in SAVE_SIZES.items():
+        state = GameState()
+        state.coins = 10 ** (skins // 10 + 6)
+        state.purchased_mask = (1 << skins) - 1
+        save_file = SaveFile(os.path.join(workdir, f'bench_{name}.bin'))
+
+        results[f'save_{name}_ms'] = measure(lambda: save_file.write({b'ST': state.to_bytes()}), 31, True) * 1000
+
+        def load():
+            GameState().load_bytes(SaveFile(save_file.path).read()[b'ST'])
+        results[f'load_{name}_ms'] = measure(load, 31, True) * 1000
+
+    return results
+
+
+def bench_app(workdir):
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+    os.environ.setdefault('SDL_VIDEODRIVER', 'offscreen')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    os.environ.setdefault('CLICKER_SPLASH', 'off')
+    # Без обмеження FPS: інакше EventLoop.idle() досипає до 1/60 с і це потрапляє в заміри
+    os.environ.setdefault('KCFG_GRAPHICS_MAXFPS', '0')
+    try:
+        import main
+        from kivy.base import EventLoop
+        from kivy.clock import Clock
+    except Exception as e:
+        print(f"Kivy недоступний, пропускаємо бенчмарки застосунку: {e}")
+        return {}
+
+    results = {}
+    app = main.ClickerApp()
+    app._run_prepare()
+
+    def wait(condition, what, timeout=30.0):
+        deadline = time.perf_counter() + timeout
+        while not condition():
+            require(time.perf_counter() < deadline, f"не дочекалися: {what}")
+            EventLoop.idle()
+    wait(lambda: app.preloader.finished, "попереднього завантаження")
+
+    clicks = 20000
+
+    def add_coin():
+        for i in range(clicks):
+            app.add_coin(app.click_button)
+            if i % 10 == 9:
+                app.click_pipeline.flush()
+        app.click_pipeline.flush()
+
+    def save_progress():
+        app.save_progress()
+        app.saver.flush()
+
+    def open_shop():
+        app.show_shop(None)
+        EventLoop.idle()
+        app.shop_popup.dismiss(animation=False)
+
+    def first_open():
+        app.shop_popup = None
+        open_shop()
+
+    # Прогрів без заміру: перший імпорт магазину, шрифти, кеші Kivy інакше потрапили б у перший замір
+    add_coin()
+    save_progress()
+    app.load_progress()
+    first_open()
+
+    results['app_add_coin_clicks_per_sec'] = clicks / measure(add_coin, 3)
+    results['app_save_progress_ms'] = measure(save_progress, 31, True) * 1000
+    results['app_load_progress_ms'] = measure(app.load_progress, 31, True) * 1000
+
+    for size in SHOP_SIZES:
+        app.catalog = synthetic_catalog(size)
+        app.shop_popup = None
+        app.show_shop(None)
+        EventLoop.idle()
+        require(app.shop_view.layout_manager.children, f"магазин на {size} позицій відкрився без карток")
+        app.shop_popup.dismiss(animation=False)
+
+        results[f'app_shop_first_open_{size}_ms'] = measure(first_open, 7) * 1000
+        results[f'app_shop_reopen_{size}_ms'] = measure(open_shop, 7) * 1000
+
+    app.catalog = synthetic_catalog(4)
+    app.shop_popup = None
+    app.show_shop(None)
+    EventLoop.idle()
+    app.state.purchased_mask = (1 << 4) - 1
+    skins = [1, 2]
+
+    # Текстури куплених скінів мають бути в пам'яті, а картки - на екрані,
+    # інакше заміряли б заглушку замість скіна і не дійшли б до refresh_card
+    for skin in skins:
+        app.select_skin(skin)
+        wait(lambda: app.skin_texture(skin) is not None, f"текстури скіна {skin}")
+    EventLoop.idle()
+    require(set(skins) <= set(app.shop_view.views_by_skin), "картки скінів не показані в магазині")
+
+    # Лише сама зміна скіна (текстура кнопки, дві картки, синхронізація стану) - без малювання
+    # кадру: воно однакове для будь-якого скіна, а в програмному OpenGL лише додає шуму
+    def select_skin():
+        for skin in skins:
+            app.select_skin(skin)
+    results['app_select_skin_ms'] = measure(select_skin, 21) * 1000 / len(skins)
+
+    app.shop_popup.dismiss(animation=False)
+    app.saver.stop()
+    Clock.unschedule(app.tick_save)
+    return results
+
+
+def compare(results, baseline, tolerance, state_only=False):
+    # Повертає назви метрик, що не пройшли: регресії, метрики без бази і невиміряні метрики з бази
+    regressions = []
+    for name in sorted(baseline):
+        if name not in results and not (state_only and name.startswith(APP_PREFIX)):
+            print(f"  {name:40s} {'-':>14s}   не виміряно")
+            regressions.append(name)
+    for name, value in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            print(f"  {name:40s} {value:14.4f}   немає базового значення (bench.py --update-baseline)")
+            regressions.append(name)
+            continue
+        higher = name.endswith(HIGHER_IS_BETTER)
+        ratio = base / value if higher else value / base
+        status = 'OK'
+        if not higher and ratio > tolerance and value - base < noise_floor(name):
+            status = 'OK (шум)'
+        elif ratio > tolerance:
+            status = 'РЕГРЕСІЯ'
+            regressions.append(name)
+        print(f"  {name:40s} {value:14.4f}   база {base:14.4f}   x{ratio:.2f} {status}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарки Clicker")
+    parser.add_argument('--update-baseline', action='store_true', help="записати результати як базові")
+    parser.add_argument('--tolerance', type=float, default=2.0,
+                        help="у скільки разів гірше за базу вважається регресією")
+    parser.add_argument('--state-only', action='store_true', help="лише бенчмарки без Kivy")
+    args = parser.parse_args(argv)
+
+    # Застосунок пише save.bin і кеші в поточну теку, тож працюємо в тимчасовій копії
+    workdir = tempfile.mkdtemp(prefix='clicker-bench-')
+    cwd = os.getcwd()
+    for name in ASSETS:
+        if os.path.exists(os.path.join(ROOT, name)):
+            shutil.copy(os.path.join(ROOT, name), workdir)
+    os.chdir(workdir)
+    sys.path.insert(0, ROOT)
+    try:
+        results = bench_state(workdir)
+        if not args.state_only:
+            results.update(bench_app(workdir))
+    except BenchError as e:
+        print(f"Бенчмарк некоректний: {e}")
+        return 1
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(RESULTS_PATH, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    if args.update_baseline:
+        if args.state_only:
+            # Базові значення застосунку лишаємо, оновлюємо лише виміряне
+            results = dict({name: value for name, value in baseline.items() if name.startswith(APP_PREFIX)},
+                           **results)
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Базові значення записано у {BASELINE_PATH}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance, args.state_only)
+    if regressions:
+        print(f"Регресії продуктивності: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
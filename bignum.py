@@ -0,0 +1,60 @@
+# Компактний показ великих чисел: 999, 1.2K, 3.4M, 5.6B, 7.8T, 5.6e30.
+# Монети - звичайний int Python (довільної довжини), тож арифметика точна,
+# а у save.bin вони пишуться без втрат через savefile.pack_int.
+#
+# CompactDisplay пам'ятає діапазон значень, що дають той самий рядок,
+# тому повторне форматування і перерисовка мітки відбуваються лише при зміні тексту.
+
+SUFFIXES = ('', 'K', 'M', 'B', 'T')
+
+
+def compact_bounds(value):
+    # Повертає (текст, нижня межа, верхня межа) - усі цілі з [нижня, верхня) мають той самий текст
+    value = int(value)
+    if value < 0:
+        text, low, high = compact_bounds(-value)
+        return '-' + text, 1 - high, 1 - low
+    if value < 1000:
+        return str(value), value, value + 1
+
+    digits = len(str(value))
+    group = (digits - 1) // 3
+    if group < len(SUFFIXES):
+        unit = 10 ** (3 * group - 1)
+        tenths = value // unit
+        whole, frac = divmod(tenths, 10)
+        text = f"{whole}.{frac}{SUFFIXES[group]}" if frac else f"{whole}{SUFFIXES[group]}"
+    else:
+        exponent = digits - 1
+        unit = 10 ** (exponent - 1)
+        tenths = value // unit
+        text = f"{tenths // 10}.{tenths % 10}e{exponent}"
+    low = tenths * unit
+    return text, low, low + unit
+
+
+def format_compact(value):
+    if isinstance(value, float) and value < 1000:
+        return f"{value:g}"
+    return compact_bounds(value)[0]
+
+
+class CompactDisplay:
+    def __init__(self):
+        self.text = None
+        self.low = 1
+        self.high = 0
+        self.formats = 0
+        self.skipped = 0
+
+    def update(self, value):
+        # Новий текст, якщо він змінився, інакше None
+        if self.low <= value < self.high:
+            self.skipped += 1
+            return None
+        self.formats += 1
+        text, self.low, self.high = compact_bounds(value)
+        if text == self.text:
+            return None
+        self.text = text
+        return text
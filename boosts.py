@@ -0,0 +1,89 @@
+# Тимчасові бусти множника (комбо, шаленство тощо).
+# Закінчення бустів зберігаються в купі за часом, а загальний множник бустів
+# перераховується лише коли буст починається або закінчується.
+import heapq
+import struct
+import time
+
+BOOST_COMBO = 1
+BOOST_FRENZY = 2
+
+BOOST_RECORD = struct.Struct('<dIB')  # залишок часу, множник, тип
+
+
+class BoostScheduler:
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.factor = 1  # добуток множників усіх активних бустів
+        self.next_expiry = None
+        self.started = 0
+        self.expired = 0
+        self._heap = []  # (час закінчення, порядковий номер, множник, тип)
+        self._seq = 0
+        self._active_kinds = {}
+
+    def __len__(self):
+        return len(self._heap)
+
+    def is_active(self, kind):
+        return self._active_kinds.get(kind, 0) > 0
+
+    def add(self, factor, duration, kind=0, now=None):
+        if now is None:
+            now = self.clock()
+        self._seq += 1
+        heapq.heappush(self._heap, (now + duration, self._seq, factor, kind))
+        self.factor *= factor
+        self._active_kinds[kind] = self._active_kinds.get(kind, 0) + 1
+        self.next_expiry = self._heap[0][0]
+        self.started += 1
+
+    def expire(self, now=None):
+        # Знімає бусти, час яких минув. Повертає True, якщо множник змінився.
+        if self.next_expiry is None:
+            return False
+        if now is None:
+            now = self.clock()
+        heap = self._heap
+        changed = False
+        while heap and heap[0][0] <= now:
+            _, _, factor, kind = heapq.heappop(heap)
+            self.factor //= factor
+            self._active_kinds[kind] -= 1
+            self.expired += 1
+            changed = True
+        self.next_expiry = heap[0][0] if heap else None
+        return changed
+
+    def time_left(self, now=None):
+        if self.next_expiry is None:
+            return None
+        if now is None:
+            now = self.clock()
+        return max(0.0, self.next_expiry - now)
+
+    def clear(self):
+        self._heap = []
+        self._active_kinds = {}
+        self.factor = 1
+        self.next_expiry = None
+
+    # Зберігається залишок часу, тож під час закриття гри бусти не згоряють
+    def to_bytes(self, now=None):
+        if now is None:
+            now = self.clock()
+        return struct.pack('<H', len(self._heap)) + b''.join(
+            BOOST_RECORD.pack(max(0.0, expires - now), factor, kind)
+            for expires, _, factor, kind in self._heap)
+
+    def load_bytes(self, data, now=None):
+        if now is None:
+            now = self.clock()
+        self.clear()
+        (size,) = struct.unpack_from('<H', data)
+        offset = 2
+        for _ in range(size):
+            remaining, factor, kind = BOOST_RECORD.unpack_from(data, offset)
+            offset += BOOST_RECORD.size
+            if remaining > 0 and factor > 0:
+                self.add(factor, remaining, kind, now)
@@ -0,0 +1,53 @@
+# Каталог скінів магазину. Дані беруться з catalog.json.
+from collections import namedtuple
+import json
+
+SkinItem = namedtuple('SkinItem', 'index image price color')
+
+# Розміри (у dp), під які готуються мініатюри скінів
+SHOP_IMAGE_DP = (280, 260)
+CLICK_BUTTON_DP = (250, 250)
+
+# Запасний каталог, якщо catalog.json відсутній
+DEFAULT_SKINS = (
+    SkinItem(1, 'item1.png', 25000, '#ffffff'),  # зелений
+    SkinItem(2, 'item2.png', 35000, '#ffffff'),  # блакитний
+    SkinItem(3, 'item3.png', 50000, '#ffffff'),  # рожевий
+    SkinItem(0, 'item4.png', 0, '#f5a742'),  # без скіна - item4.png лише для магазину
+)
+
+
+class SkinCatalog:
+    def __init__(self, items=DEFAULT_SKINS):
+        self.items = tuple(items)
+        self.by_index = {item.index: item for item in self.items}
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, skin_index):
+        return self.by_index[skin_index]
+
+    def button_image(self, skin_index):
+        # Скін 0 - кнопка без фото
+        if skin_index == 0 or skin_index not in self.by_index:
+            return ''
+        return self.by_index[skin_index].image
+
+    def button_color(self, skin_index):
+        item = self.by_index.get(skin_index)
+        return item.color if item else '#ffffff'
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return cls(SkinItem(int(s['index']), s['image'], int(s['price']), s.get('color', '#ffffff'))
+                       for s in data['skins'])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Помилка завантаження каталогу: {e}")
+            return cls()
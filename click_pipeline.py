@@ -0,0 +1,62 @@
+# Конвеєр кліків: натискання лише накопичуються, а застосовуються
+# одним пакетом раз на кадр (через Clock.create_trigger у ClickerApp).
+from collections import deque
+import time
+
+
+class ClickPipeline:
+    def __init__(self, apply_batch, schedule=None, rate_window=1.0, clock=time.perf_counter):
+        self.apply_batch = apply_batch
+        self.schedule = schedule
+        self.rate_window = rate_window
+        self.clock = clock
+
+        self.pending = 0
+        self.total_clicks = 0
+        self.batches = 0
+        self.last_batch = 0
+        self.max_batch = 0
+        self._history = deque(maxlen=256)  # (час, розмір пакета)
+
+    def push(self, count=1):
+        self.pending += count
+        if self.schedule is not None:
+            self.schedule()
+        else:
+            self.flush()
+
+    def flush(self, *args):
+        count = self.pending
+        if not count:
+            return 0
+        self.pending = 0
+
+        self.total_clicks += count
+        self.batches += 1
+        self.last_batch = count
+        if count > self.max_batch:
+            self.max_batch = count
+        self._history.append((self.clock(), count))
+
+        self.apply_batch(count)
+        return count
+
+    def clicks_per_second(self):
+        now = self.clock()
+        history = self._history
+        while history and now - history[0][0] > self.rate_window:
+            history.popleft()
+        return sum(count for _, count in history) / self.rate_window
+
+    def avg_batch(self):
+        return self.total_clicks / self.batches if self.batches else 0.0
+
+    def stats(self):
+        return {
+            'clicks_per_second': self.clicks_per_second(),
+            'total_clicks': self.total_clicks,
+            'batches': self.batches,
+            'last_batch': self.last_batch,
+            'max_batch': self.max_batch,
+            'avg_batch': self.avg_batch(),
+        }
@@ -0,0 +1,55 @@
+# Кнопка кліку, що малює себе інструкціями canvas.
+# Скін - це лише заміна текстури в уже створеному Rectangle (текстури тримаються в пам'яті),
+# а натискання - масштаб через Scale, без другої картинки і без читання файлів.
+from kivy.core.text import Label as CoreLabel
+from kivy.graphics import Color, PopMatrix, PushMatrix, Rectangle, Scale
+from kivy.metrics import dp
+from kivy.uix.behaviors import ButtonBehavior
+from kivy.uix.widget import Widget
+from kivy.utils import get_color_from_hex
+
+
+class ClickButton(ButtonBehavior, Widget):
+    def __init__(self, text="КЛІКАЙ!", font_size=30, pressed_scale=0.93, **kwargs):
+        super().__init__(**kwargs)
+        self.pressed_scale = pressed_scale
+        self.texture = None
+        self.skin_changes = 0
+
+        # Напис для кнопки без скіна рендериться один раз
+        label = CoreLabel(text=text, font_size=dp(font_size), bold=True, color=(0, 0, 0, 1))
+        label.refresh()
+        self.text_texture = label.texture
+
+        with self.canvas:
+            PushMatrix()
+            self.scale = Scale(1)
+            self.color = Color(1, 1, 1, 1)
+            self.background = Rectangle()
+            self.text_color = Color(1, 1, 1, 1)
+            self.text_rect = Rectangle(texture=self.text_texture, size=self.text_texture.size)
+            PopMatrix()
+
+        self.bind(pos=self._update_rects, size=self._update_rects, state=self._update_press)
+
+    def set_skin(self, texture, color='#ffffff', caption=None):
+        # texture=None - кнопка без скіна: суцільний колір і напис.
+        # caption=False - заглушка, поки текстура скіна ще завантажується.
+        if caption is None:
+            caption = texture is None
+        self.texture = texture
+        self.background.texture = texture
+        self.color.rgba = get_color_from_hex(color)
+        self.text_color.a = 1 if caption else 0
+        self.skin_changes += 1
+
+    def _update_rects(self, *args):
+        self.background.pos = self.pos
+        self.background.size = self.size
+        tw, th = self.text_rect.size
+        self.text_rect.pos = (self.center_x - tw / 2, self.center_y - th / 2)
+        self.scale.origin = self.center
+
+    def _update_press(self, instance, state):
+        s = self.pressed_scale if state == 'down' else 1
+        self.scale.xyz = (s, s, 1)
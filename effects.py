@@ -0,0 +1,128 @@
+# Шар ефектів кліку: спливаючі "+N" і розліт частинок.
+# Усі мітки та інструкції canvas створюються один раз і перевикористовуються по колу,
+# тому кількість живих ефектів обмежена, а нові кліки витісняють найстаріші.
+from math import cos, sin, pi
+import random
+
+from kivy.clock import Clock
+from kivy.graphics import Color, Ellipse
+from kivy.metrics import dp
+from kivy.uix.label import Label
+from kivy.uix.widget import Widget
+from kivy.utils import get_color_from_hex
+
+
+class EffectsLayer(Widget):
+    def __init__(self, max_labels=12, max_particles=48, burst=6, lifetime=0.8, **kwargs):
+        super().__init__(**kwargs)
+        self.lifetime = lifetime
+        self.burst = burst
+        self.rise = dp(80)
+        self.particle_speed = dp(120)
+        self.particle_size = dp(8)
+
+        self.labels = []
+        self.label_age = [None] * max_labels  # None - слот вільний
+        self.label_origin = [(0, 0)] * max_labels
+        self.next_label = 0
+        for _ in range(max_labels):
+            label = Label(
+                size_hint=(None, None),
+                size=(dp(100), dp(40)),
+                font_size=dp(26),
+                bold=True,
+                opacity=0
+            )
+            self.labels.append(label)
+            self.add_widget(label)
+
+        # Напрямки розльоту рахуються один раз
+        self.directions = [(cos(2 * pi * i / 16), sin(2 * pi * i / 16)) for i in range(16)]
+        self.particle_colors = []
+        self.particle_shapes = []
+        self.particle_age = [None] * max_particles
+        self.particle_origin = [(0, 0)] * max_particles
+        self.particle_velocity = [(0, 0)] * max_particles
+        self.next_particle = 0
+        with self.canvas:
+            for _ in range(max_particles):
+                self.particle_colors.append(Color(1, 1, 1, 0))
+                self.particle_shapes.append(Ellipse(size=(0, 0)))
+
+        self.live = 0
+        self.recycled = 0
+        self._event = None
+
+    def spawn(self, x, y, text, color='#ffffff'):
+        i = self.next_label
+        self.next_label = (i + 1) % len(self.labels)
+        if self.label_age[i] is not None:
+            self.recycled += 1
+        else:
+            self.live += 1
+
+        label = self.labels[i]
+        if label.text != text:
+            label.text = text
+        label.color = get_color_from_hex(color)
+        label.center = (x, y)
+        label.opacity = 1
+        self.label_age[i] = 0.0
+        self.label_origin[i] = (x, y)
+
+        rgba = get_color_from_hex(color)
+        offset = random.randrange(len(self.directions))
+        for k in range(self.burst):
+            j = self.next_particle
+            self.next_particle = (j + 1) % len(self.particle_shapes)
+            dx, dy = self.directions[(offset + k * len(self.directions) // self.burst) % len(self.directions)]
+            speed = self.particle_speed * (0.6 + 0.4 * random.random())
+            self.particle_age[j] = 0.0
+            self.particle_origin[j] = (x, y)
+            self.particle_velocity[j] = (dx * speed, dy * speed)
+            self.particle_colors[j].rgba = rgba
+            self.particle_shapes[j].size = (self.particle_size, self.particle_size)
+
+        if self._event is None:
+            self._event = Clock.schedule_interval(self._update, 0)
+
+    def _update(self, dt):
+        lifetime = self.lifetime
+        active = False
+
+        for i, age in enumerate(self.label_age):
+            if age is None:
+                continue
+            age += dt
+            label = self.labels[i]
+            if age >= lifetime:
+                self.label_age[i] = None
+                label.opacity = 0
+                self.live -= 1
+                continue
+            self.label_age[i] = age
+            progress = age / lifetime
+            x, y = self.label_origin[i]
+            label.center = (x, y + self.rise * progress)
+            label.opacity = 1 - progress
+            active = True
+
+        half = self.particle_size / 2
+        for j, age in enumerate(self.particle_age):
+            if age is None:
+                continue
+            age += dt
+            if age >= lifetime:
+                self.particle_age[j] = None
+                self.particle_colors[j].a = 0
+                continue
+            self.particle_age[j] = age
+            x, y = self.particle_origin[j]
+            vx, vy = self.particle_velocity[j]
+            self.particle_shapes[j].pos = (x + vx * age - half, y + vy * age - half)
+            self.particle_colors[j].a = 1 - age / lifetime
+            active = True
+
+        if not active:
+            self._event = None
+            return False
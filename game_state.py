@@ -0,0 +1,237 @@
+# Ігрова логіка без залежності від Kivy.
+# ClickerApp і ShopItem лише відображають стан і передають сюди дії гравця.
+from bisect import bisect_right
+from collections import namedtuple
+import json
+import struct
+
+from boosts import BoostScheduler
+from income import IncomeEngine
+from savefile import pack_int, unpack_int
+
+# множник, рівень, гучність музики, гучність звуків, скін, прапорці (музика, звуки)
+CORE_RECORD = struct.Struct('<IIddIB')
+
+UpgradeTier = namedtuple('UpgradeTier', 'threshold multiplier label color')
+
+# Запасна таблиця, якщо upgrades.json відсутній
+UPGRADE_TIERS = (
+    UpgradeTier(250, 2, "x2!", '#42f554'),
+    UpgradeTier(1000, 3, "x3!", '#42a1f5'),
+    UpgradeTier(10000, 4, "x4!", '#28fc03'),
+)
+
+
+class UpgradeTable:
+    def __init__(self, tiers=UPGRADE_TIERS):
+        self.tiers = tuple(sorted(tiers, key=lambda tier: tier.threshold))
+        self.thresholds = [tier.threshold for tier in self.tiers]
+
+    def __len__(self):
+        return len(self.tiers)
+
+    def __getitem__(self, level):
+        return self.tiers[level]
+
+    def next_threshold(self, level):
+        # Поріг наступного рівня або None, якщо всі рівні відкриті
+        return self.thresholds[level] if level < len(self.thresholds) else None
+
+    def level_for(self, coins):
+        # Кількість рівнів, поріг яких уже досягнуто
+        return bisect_right(self.thresholds, coins)
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return cls(UpgradeTier(int(t['threshold']), int(t['multiplier']), t['label'], t['color'])
+                       for t in data['tiers'])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Помилка завантаження таблиці покращень: {e}")
+            return cls()
+
+
+class GameState:
+    __slots__ = (
+        'coins',
+        'multiplier',
+        'upgrade_level',
+        'music_volume',
+        'sound_volume',
+        'current_skin',
+        'purchased_mask',
+        'music_on',
+        'sound_on',
+    )
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.coins = 0
+        self.multiplier = 1
+        self.upgrade_level = 0
+        self.music_volume = 0.5
+        self.sound_volume = 1.0
+        self.current_skin = 0  # 0 - без скіна
+        self.purchased_mask = 1  # скін 0 завжди доступний
+        self.music_on = True
+        self.sound_on = True
+
+    def is_purchased(self, skin_index):
+        return bool(self.purchased_mask >> skin_index & 1)
+
+    def purchased_skins(self):
+        mask = self.purchased_mask
+        skins = []
+        index = 0
+        while mask:
+            if mask & 1:
+                skins.append(index)
+            mask >>= 1
+            index += 1
+        return skins
+
+    # Старий формат xui.txt: "монети,множник,рівень,музика,звуки,скін,0|1|2"
+    def load_legacy(self, text):
+        data = text.strip().split(',')
+        self.coins = int(data[0]) if len(data) > 0 else 0
+        self.multiplier = int(data[1]) if len(data) > 1 else 1
+        self.upgrade_level = int(data[2]) if len(data) > 2 else 0
+        self.music_volume = float(data[3]) if len(data) > 3 else 0.5
+        self.sound_volume = float(data[4]) if len(data) > 4 else 1.0
+        self.current_skin = int(data[5]) if len(data) > 5 else 0
+        mask = 1
+        if len(data) > 6:
+            for skin in data[6].split('|'):
+                if skin:
+                    mask |= 1 << int(skin)
+        self.purchased_mask = mask
+
+    # Старий progress.json: {"coins": .., "purchased_skins": [0, ..], ...}
+    def load_json(self, text):
+        data = json.loads(text)
+        self.coins = int(data.get('coins', 0))
+        self.multiplier = int(data.get('multiplier', 1))
+        self.upgrade_level = int(data.get('upgrade_level', 0))
+        self.music_volume = float(data.get('music_volume', 0.5))
+        self.sound_volume = float(data.get('sound_volume', 1.0))
+        self.current_skin = int(data.get('current_skin', 0))
+        mask = 1
+        for skin in data.get('purchased_skins', [0]):
+            mask |= 1 << int(skin)
+        self.purchased_mask = mask
+
+    def to_bytes(self):
+        flags = (1 if self.music_on else 0) | (2 if self.sound_on else 0)
+        return CORE_RECORD.pack(
+            self.multiplier,
+            self.upgrade_level,
+            self.music_volume,
+            self.sound_volume,
+            self.current_skin,
+            flags
+        ) + pack_int(self.coins) + pack_int(self.purchased_mask)
+
+    def load_bytes(self, data):
+        (self.multiplier, self.upgrade_level, self.music_volume, self.sound_volume,
+         self.current_skin, flags) = CORE_RECORD.unpack_from(data)
+        self.music_on = bool(flags & 1)
+        self.sound_on = bool(flags & 2)
+        self.coins, offset = unpack_int(data, CORE_RECORD.size)
+        self.purchased_mask, _ = unpack_int(data, offset)
+        self.purchased_mask |= 1
+
+
+class GameEngine:
+    def __init__(self, state=None, tiers=None, income=None, boosts=None):
+        self.state = state if state is not None else GameState()
+        self.tiers = tiers if tiers is not None else UpgradeTable()
+        self.income = income if income is not None else IncomeEngine()
+        self.boosts = boosts if boosts is not None else BoostScheduler()
+        self.refresh()
+
+    def refresh(self):
+        # Викликати після зовнішньої зміни стану (завантаження, скидання)
+        self.next_threshold = self.tiers.next_threshold(self.state.upgrade_level)
+
+    def click(self, count=1):
+        # Додає count кліків одразу. Повертає True, якщо змінився рівень покращення.
+        # Покращення діє з наступного кліку після досягнення порогу - як і при поодиноких кліках.
+        # Множник бустів уже перерахований BoostScheduler, тут лише читаємо його.
+        s = self.state
+        per_click = self.effective_multiplier()
+        gain = count * per_click
+        if self.next_threshold is None or s.coins + gain < self.next_threshold:
+            s.coins += gain
+            return False
+
+        upgraded = False
+        while count > 0:
+            threshold = self.next_threshold
+            if threshold is None or threshold - s.coins > count * per_click:
+                s.coins += count * per_click
+                break
+            clicks = max(1, -(-(threshold - s.coins) // per_click))
+            s.coins += clicks * per_click
+            count -= clicks
+            if self._promote():
+                upgraded = True
+                per_click = self.effective_multiplier()
+        return upgraded
+
+    def effective_multiplier(self):
+        # Монет за клік: множник рівня і всіх активних бустів
+        return self.state.multiplier * self.boosts.factor
+
+    def settle(self, now=None):
+        # Нараховує пасивний дохід. Повертає True, якщо змінився рівень покращення.
+        if not self.income.settle(self.state, now):
+            return False
+        if self.next_threshold is not None and self.state.coins >= self.next_threshold:
+            return self._promote()
+        return False
+
+    def balance(self):
+        # Баланс з доходом, нарахованим на цю мить: генератори рахуються лише при читанні
+        self.settle()
+        return self.state.coins
+
+    def buy_generator(self, generator_id):
+        self.settle()
+        return self.income.buy(self.state, generator_id)
+
+    def _promote(self):
+        s = self.state
+        level = max(s.upgrade_level, self.tiers.level_for(s.coins))
+        if level == s.upgrade_level:
+            return False
+        s.upgrade_level = level
+        s.multiplier = self.tiers[level - 1].multiplier
+        self.next_threshold = self.tiers.next_threshold(level)
+        return True
+
+    def current_tier(self):
+        level = self.state.upgrade_level
+        return self.tiers[level - 1] if level > 0 else None
+
+    def can_afford(self, price):
+        return price == 0 or self.balance() >= price
+
+    def buy_skin(self, skin_index, price):
+        s = self.state
+        if s.is_purchased(skin_index):
+            return True
+        if not self.can_afford(price):
+            return False
+        s.coins -= price
+        s.purchased_mask |= 1 << skin_index
+        return True
+
+    def select_skin(self, skin_index):
+        if not self.state.is_purchased(skin_index):
+            return False
+        self.state.current_skin = skin_index
+        return True
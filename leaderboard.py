@@ -0,0 +1,278 @@
+# Синхронізація з таблицею рекордів у фоновому потоці з власним циклом asyncio.
+#
+# UI-потік лише кладе знімок стану і події покупок у буфер (publish/record) - без мережі.
+# Фоновий цикл раз на interval секунд надсилає один пакет: лише поля, що змінилися
+# з останнього підтвердженого знімка, і накопичені покупки. З'єднання одне і
+# перевикористовується; при помилці - повтор із експоненційною затримкою, а
+# непідтверджене зберігається на диск і надсилається після перезапуску.
+#
+# Протокол: кадр = довжина (u32) + JSON.
+#   клієнт: {"op": "sync", "player", "seq", "base", "delta": {...}, "events": [...]}
+#   сервер: {"op": "ack", "seq", "rank"} або {"op": "resync"}, якщо base не збігся
+# Кожна подія має свій eid: повторно надіслані після втраченої відповіді сервер не рахує вдруге.
+import asyncio
+import json
+import os
+import random
+import struct
+import threading
+import uuid
+
+from persistence import atomic_write
+
+FRAME = struct.Struct('<I')
+MAX_FRAME = 1024 * 1024
+_MISSING = object()
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def encode_frame(message):
+    body = json.dumps(message, separators=(',', ':')).encode('utf-8')
+    return FRAME.pack(len(body)) + body
+
+
+async def read_frame(reader):
+    header = await reader.readexactly(FRAME.size)
+    (size,) = FRAME.unpack(header)
+    if size > MAX_FRAME:
+        raise ProtocolError(f"кадр завеликий: {size}")
+    return json.loads(await reader.readexactly(size))
+
+
+def load_player_id(path):
+    # Ідентифікатор гравця створюється один раз і лежить поруч зі збереженням
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            player_id = f.read().strip()
+        if player_id:
+            return player_id
+    except OSError:
+        pass
+    player_id = uuid.uuid4().hex
+    try:
+        atomic_write(path, player_id.encode('utf-8'))
+    except OSError as e:
+        print(f"Помилка збереження ідентифікатора гравця: {e}")
+    return player_id
+
+
+def parse_address(address, default_port=8765):
+    host, _, port = address.rpartition(':')
+    if not host:
+        return address, default_port
+    return host, int(port)
+
+
+class LeaderboardClient:
+    def __init__(self, host, port, player_id, queue_path=None, interval=5.0, timeout=5.0,
+                 backoff=0.5, max_backoff=60.0, max_events=1000):
+        self.host = host
+        self.port = port
+        self.player_id = player_id
+        self.queue_path = queue_path
+        self.interval = interval
+        self.timeout = timeout
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_events = max_events
+
+        self._lock = threading.Lock()  # publish/record викликаються з UI-потоку
+        self.latest = None  # останній опублікований знімок
+        self.events = []  # ще не надіслані події
+        self.in_flight = []  # надіслані, але ще не підтверджені
+
+        self.acked = {}  # поля, які вже має сервер
+        self.acked_seq = 0
+        self.seq = 0
+        self.rank = None
+        self.failures = 0
+        self.queue_saved = False  # чи лежить непідтверджене на диску
+
+        self.batches = 0
+        self.bytes_sent = 0
+        self.errors = 0
+        self.dropped_events = 0
+
+        self._reader = None
+        self._writer = None
+        self._loop = None
+        self._stopping = None
+        self._thread = None
+        self.load_queue()
+
+    # --- UI-потік ---
+
+    def publish(self, snapshot):
+        with self._lock:
+            self.latest = snapshot
+
+    def record(self, event):
+        event = dict(event, eid=uuid.uuid4().hex)
+        with self._lock:
+            self._append_events([event])
+
+    def start(self):
+        self._thread = threading.Thread(target=asyncio.run, args=(self._run(),), name='Leaderboard', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        # Остання спроба надіслати, потім непідтверджене - на диск
+        if self._loop is not None and self._stopping is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.save_queue()
+
+    # --- фоновий цикл ---
+
+    async def _run(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        try:
+            while not self._stopping.is_set():
+                delay = self.interval if await self.sync_once() else self.retry_delay()
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+            await self.sync_once()
+        finally:
+            await self.close()
+
+    def retry_delay(self):
+        # Експоненційна затримка з випадковим розкидом, щоб клієнти не поверталися всі разом
+        delay = min(self.max_backoff, self.backoff * 2 ** min(self.failures, 16))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def sync_once(self):
+        # Повертає True, якщо сервер має актуальний стан
+        with self._lock:
+            snapshot = self.latest
+            events, self.events = self.events, []
+            self.in_flight = events
+        delta = {}
+        if snapshot is not None:
+            delta = {name: value for name, value in snapshot.items() if self.acked.get(name, _MISSING) != value}
+        if not delta and not events:
+            self.in_flight = []
+            return True
+
+        self.seq += 1
+        message = {'op': 'sync', 'player': self.player_id, 'seq': self.seq, 'base': self.acked_seq,
+                   'delta': delta, 'events': events}
+        try:
+            response = await asyncio.wait_for(self._request(message), self.timeout)
+        except (OSError, EOFError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError,
+                ProtocolError) as e:
+            self.errors += 1
+            self.failures += 1
+            await self.close()
+            self._requeue(events)
+            if self.failures == 1:
+                print(f"Таблиця рекордів недоступна: {e}")
+            self.save_queue()
+            return False
+
+        if response.get('op') == 'resync':
+            # Сервер не має нашої бази (наприклад, перезапустився) - наступного разу весь знімок
+            self.acked = {}
+            self.acked_seq = 0
+            self._requeue(events)
+            return False
+
+        with self._lock:
+            self.in_flight = []
+        self.acked.update(delta)
+        self.acked_seq = self.seq
+        self.rank = response.get('rank')
+        self.failures = 0
+        if self.queue_saved:
+            self.clear_queue()
+        return True
+
+    async def _request(self, message):
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        data = encode_frame(message)
+        self._writer.write(data)
+        await self._writer.drain()
+        self.batches += 1
+        self.bytes_sent += len(data)
+        return await read_frame(self._reader)
+
+    async def close(self):
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    def _requeue(self, events):
+        with self._lock:
+            self.in_flight = []
+            self._append_events(events, front=True)
+
+    def _append_events(self, events, front=False):
+        merged = events + self.events if front else self.events + events
+        overflow = len(merged) - self.max_events
+        if overflow > 0:
+            # Черга обмежена: найстаріші події відкидаються
+            self.dropped_events += overflow
+            merged = merged[overflow:]
+        self.events = merged
+
+    # --- черга на диску ---
+
+    def save_queue(self):
+        if self.queue_path is None:
+            return
+        with self._lock:
+            # Події запиту, що ще чекає відповіді, теж зберігаються - інакше вони зникнуть при виході
+            pending = self.in_flight + self.events
+            snapshot = self.latest
+        if not pending and (snapshot is None or all(self.acked.get(k) == v for k, v in snapshot.items())):
+            self.clear_queue()
+            return
+        data = {'player': self.player_id, 'snapshot': snapshot, 'events': pending}
+        try:
+            atomic_write(self.queue_path, json.dumps(data).encode('utf-8'))
+            self.queue_saved = True
+        except OSError as e:
+            print(f"Помилка збереження черги рекордів: {e}")
+
+    def load_queue(self):
+        if self.queue_path is None or not os.path.exists(self.queue_path):
+            return
+        try:
+            with open(self.queue_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('player') == self.player_id:
+                self.latest = data.get('snapshot')
+                self._append_events(list(data.get('events', [])))
+                self.queue_saved = True
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"Помилка завантаження черги рекордів: {e}")
+
+    def clear_queue(self):
+        self.queue_saved = False
+        if self.queue_path is not None and os.path.exists(self.queue_path):
+            try:
+                os.remove(self.queue_path)
+            except OSError as e:
+                print(f"Помилка видалення черги рекордів: {e}")
+
+    def stats(self):
+        return {
+            'batches': self.batches,
+            'bytes_sent': self.bytes_sent,
+            'errors': self.errors,
+            'pending_events': len(self.in_flight) + len(self.events),
+            'dropped_events': self.dropped_events,
+            'rank': self.rank,
+        }
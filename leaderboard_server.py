@@ -0,0 +1,197 @@
+# Локальний сервер таблиці рекордів: заміна справжнього для розробки і навантажувального тесту.
+#
+#   python leaderboard_server.py                           # слухати 127.0.0.1:8765
+#   python main.py --leaderboard 127.0.0.1:8765            # гра синхронізується з ним
+#   python leaderboard_server.py --bench --clients 2000    # тисячі імітованих клієнтів
+#
+# Імітовані клієнти - це справжні LeaderboardClient (без фонового потоку) в одному циклі asyncio.
+import argparse
+import asyncio
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+import random
+import statistics
+import sys
+import time
+
+from leaderboard import LeaderboardClient, ProtocolError, encode_frame, read_frame
+
+
+class LeaderboardServer:
+    remembered_events = 2048  # скільки eid подій на гравця пам'ятати для відсіювання повторів
+
+    def __init__(self, latency=0.0):
+        self.latency = latency  # штучна затримка відповіді, сек
+        self.players = {}  # id -> {'seq', 'state', 'purchases', 'seen', 'seen_ids'}
+        self.scores = []  # монети всіх гравців, відсортовані - для місця в таблиці
+        self.requests = 0
+        self.resyncs = 0
+        self.duplicates = 0
+        self.connections = 0
+        self.bytes_received = 0
+        self._server = None
+
+    async def start(self, host='127.0.0.1', port=8765):
+        self._server = await asyncio.start_server(self.handle, host, port, backlog=4096)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                message = await read_frame(reader)
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                writer.write(encode_frame(self.apply(message)))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ProtocolError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def apply(self, message):
+        self.requests += 1
+        op = message.get('op')
+        if op == 'top':
+            return {'op': 'top', 'players': self.top(int(message.get('n', 10)))}
+        if op != 'sync':
+            return {'op': 'error', 'reason': f"невідома операція {op}"}
+
+        player_id = message['player']
+        player = self.players.get(player_id)
+        base = message.get('base', 0)
+        if player is None:
+            if base != 0:
+                self.resyncs += 1
+                return {'op': 'resync'}
+            player = self.players[player_id] = {'seq': 0, 'state': {}, 'purchases': 0,
+                                                'seen': deque(), 'seen_ids': set()}
+        elif base == 0:
+            # Повний знімок (запуск клієнта або resync) замінює лише стан; накопичені лічильники лишаються
+            self._remove_score(player)
+            player['state'] = {}
+        elif player['seq'] != base:
+            self.resyncs += 1
+            return {'op': 'resync'}
+        else:
+            self._remove_score(player)
+
+        player['state'].update(message.get('delta', {}))
+        player['seq'] = message['seq']
+        for event in message.get('events', ()):
+            if self._first_time(player, event.get('eid')):
+                player['purchases'] += 1
+        coins = player['state'].get('coins', 0)
+        insort(self.scores, coins)
+        return {'op': 'ack', 'seq': message['seq'], 'rank': len(self.scores) - bisect_right(self.scores, coins) + 1}
+
+    def _first_time(self, player, event_id):
+        if event_id is None:
+            return True
+        if event_id in player['seen_ids']:
+            self.duplicates += 1
+            return False
+        player['seen'].append(event_id)
+        player['seen_ids'].add(event_id)
+        if len(player['seen']) > self.remembered_events:
+            player['seen_ids'].discard(player['seen'].popleft())
+        return True
+
+    def _remove_score(self, player):
+        coins = player['state'].get('coins', 0)
+        i = bisect_left(self.scores, coins)
+        if i < len(self.scores) and self.scores[i] == coins:
+            del self.scores[i]
+
+    def top(self, n=10):
+        ranked = sorted(self.players.items(), key=lambda item: item[1]['state'].get('coins', 0), reverse=True)
+        return [{'player': player_id, **player['state']} for player_id, player in ranked[:n]]
+
+
+async def run_bench(clients, rounds, think, latency):
+    server = LeaderboardServer(latency)
+    port = await server.start(port=0)
+    latencies = []
+    failures = 0
+
+    async def simulate(index):
+        nonlocal failures
+        client = LeaderboardClient('127.0.0.1', port, f'bench-{index}', timeout=30.0)
+        coins = clicks = 0
+        for r in range(rounds):
+            clicks += random.randint(1, 200)
+            coins += clicks * 3
+            # Рівень змінюється рідко - у дельту здебільшого потрапляють лише монети і кліки
+            client.publish({'coins': coins, 'upgrade_level': r // 5, 'clicks': clicks, 'skins': 1})
+            if r % 4 == 0:
+                client.record({'type': 'generator', 'id': 0, 'price': 500})
+            start = time.perf_counter()
+            if not await client.sync_once():
+                failures += 1
+            latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(random.uniform(0, think))
+        await client.close()
+        return client
+
+    start = time.perf_counter()
+    simulated = await asyncio.gather(*(simulate(i) for i in range(clients)))
+    elapsed = time.perf_counter() - start
+    await server.stop()
+
+    latencies.sort()
+    batches = sum(client.batches for client in simulated)
+    return {
+        'clients': clients,
+        'batches': batches,
+        'seconds': elapsed,
+        'batches_per_sec': batches / elapsed,
+        'latency_p50_ms': latencies[len(latencies) // 2] * 1000,
+        'latency_p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        'latency_mean_ms': statistics.mean(latencies) * 1000,
+        'bytes_per_batch': sum(client.bytes_sent for client in simulated) / batches,
+        'connections': server.connections,  # при перевикористанні з'єднань дорівнює кількості клієнтів
+        'failures': failures,
+        'players': len(server.players),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Локальний сервер таблиці рекордів Clicker")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="штучна затримка відповіді, сек")
+    parser.add_argument('--bench', action='store_true', help="навантажувальний тест з імітованими клієнтами")
+    parser.add_argument('--clients', type=int, default=2000)
+    parser.add_argument('--rounds', type=int, default=10, help="скільки пакетів надсилає кожен клієнт")
+    parser.add_argument('--think', type=float, default=0.05, help="найбільша пауза клієнта між пакетами, сек")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        results = asyncio.run(run_bench(args.clients, args.rounds, args.think, args.latency))
+        for name, value in results.items():
+            print(f"  {name:20s} {value:12.2f}" if isinstance(value, float) else f"  {name:20s} {value:12d}")
+        return 1 if results['failures'] else 0
+
+    async def serve():
+        server = LeaderboardServer(args.latency)
+        port = await server.start(args.host, args.port)
+        print(f"Сервер рекордів слухає {args.host}:{port}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,20 +1,50 @@
+import time
+STARTUP_START = time.perf_counter()
+
+import sys
+from startup import StartupTimeline, parse_startup_args
+# Наші прапорці (--no-splash, --short-splash, --profile, --record, --replay) треба прибрати до імпорту Kivy
+STARTUP_OPTIONS = parse_startup_args(sys.argv)
+
 from kivy.app import App
 from kivy.uix.button import Button
 from kivy.uix.label import Label
 from kivy.uix.floatlayout import FloatLayout
 from kivy.uix.image import Image
-from kivy.uix.slider import Slider
-from kivy.uix.popup import Popup
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.scrollview import ScrollView
-from kivy.uix.togglebutton import ToggleButton
 from kivy.core.window import Window
 from kivy.utils import get_color_from_hex
 from kivy.animation import Animation
 from kivy.core.audio import SoundLoader
 from kivy.clock import Clock
 from kivy.metrics import dp
+from persistence import SaveManager
+from savefile import SaveError, SaveFile
+from game_state import GameEngine, UpgradeTable
+from click_pipeline import ClickPipeline
+from catalog import SkinCatalog, CLICK_BUTTON_DP, SHOP_IMAGE_DP
+from asset_cache import AssetCache
+from preloader import Preloader
+from audio import VoicePool
+from effects import EffectsLayer
+from click_widget import ClickButton
+from store import GameStore
+from income import IncomeEngine, load_generators
+from bignum import CompactDisplay, format_compact
+from boosts import BOOST_COMBO, BOOST_FRENZY
+from notifications import NotificationManager
+from profiling import Profiler
+from stats import STAT_CLICKS, STAT_PEAK_CPS, StatsEngine, load_achievements
+from leaderboard import LeaderboardClient, load_player_id, parse_address
+from replay import (EVENT_BUY_GENERATOR, EVENT_BUY_SKIN, EVENT_CLICK, EVENT_FRENZY, EVENT_MUSIC_ON,
+                    EVENT_MUSIC_VOLUME, EVENT_SELECT_SKIN, EVENT_SOUND_ON, EVENT_SOUND_VOLUME, TraceRecorder,
+                    TraceReplayer, read_trace)
+import json
 import os
+import random
+
+STARTUP = StartupTimeline(STARTUP_START)
+STARTUP.mark('import')
 
 
 class Notification(Label):
@@ -31,177 +61,107 @@ class Notification(Label):
         self.markup = True
 
 
-class ShopItem(BoxLayout):
-    def __init__(self, image_source, price_text, price, app_instance, skin_index, **kwargs):
-        super().__init__(**kwargs)
-        self.orientation = 'vertical'
-        self.size_hint = (None, None)
-        self.size = (dp(300), dp(400))
-        self.spacing = dp(10)
-        self.padding = dp(10)
-        self.app = app_instance
-        self.price = price
-        self.skin_index = skin_index
-        self.purchased = False
-        self.image_source = image_source
-
-        if os.path.exists('xui.txt'):
-            with open('xui.txt', 'r') as f:
-                data = f.read().strip().split(',')
-                if len(data) > 6:
-                    purchased_skins = data[6].split('|')
-                    self.purchased = str(skin_index) in purchased_skins or price == 0
-
-        self.skin_colors = [
-            '#f5a742',  # стандартний (0)
-            '#ffffff',  # зелений (1)
-            '#ffffff',  # блакитний (2)
-            '#ffffff'  # рожевий (3)
-        ]
-
-        self.image = Image(
-            source=image_source,
-            size_hint=(1, 0.7),
-            allow_stretch=True,
-            keep_ratio=False
-        )
-
-        if skin_index == 0:
-            price_display = "БЕЗЦІННО!"
-            self.purchased = True
-        else:
-            price_display = "БЕЗКОШТОВНО!" if price == 0 else f"{price:,} монет"
-
-        self.price_label = Label(
-            text=price_display,
-            size_hint=(1, 0.1),
-            font_size=dp(20),
-            bold=True
-        )
-
-        if skin_index == 0:
-            btn_text = "Не можна отримати"
-            btn_disabled = True
-            btn_color = '#cccccc'
-        else:
-            btn_text = "Отримати" if price == 0 else ("Куплено" if self.purchased else "Купити")
-            btn_disabled = self.purchased or (price == 0 and self.purchased)
-            btn_color = '#42a1f5' if price == 0 else ('#cccccc' if self.purchased else '#42f554')
-
-        self.buy_button = Button(
-            text=btn_text,
-            size_hint=(1, 0.1),
-            background_color=get_color_from_hex(btn_color),
-            background_normal='',
-            disabled=btn_disabled,
-            on_press=self.buy_item
-        )
-
-        select_disabled = not self.purchased or skin_index == 0
-        self.select_button = ToggleButton(
-            text="Обрано" if self.app.current_skin == skin_index else "Обрати",
-            size_hint=(1, 0.1),
-            background_color=get_color_from_hex('#42a1f5'),
-            background_normal='',
-            state='down' if self.app.current_skin == skin_index else 'normal',
-            group='skins',
-            disabled=select_disabled,
-            on_press=self.select_skin
-        )
-
-        self.add_widget(self.image)
-        self.add_widget(self.price_label)
-        self.add_widget(self.buy_button)
-        self.add_widget(self.select_button)
-
-    def buy_item(self, instance):
-        if self.price == 0 or self.app.coins >= self.price:
-            if self.price > 0:
-                self.app.coins -= self.price
-
-            self.purchased = True
-            self.buy_button.disabled = True
-            self.buy_button.text = "Куплено" if self.price > 0 else "Отримано"
-            self.buy_button.background_color = get_color_from_hex('#cccccc')
-            self.select_button.disabled = False
-
-            if str(self.skin_index) not in self.app.purchased_skins:
-                self.app.purchased_skins.append(str(self.skin_index))
-
-            self.select_button.state = 'down'
-            self.select_skin(self.select_button)
-
-            self.app.update_balance()
-            self.app.save_progress()
-        else:
-            self.app.show_notification("[b]Недостатньо коштів![/b]")
-
-    def select_skin(self, instance):
-        if instance.state == 'down':
-            self.app.current_skin = self.skin_index
-            if self.skin_index == 0:  # Без скіна
-                self.app.click_button.text = "[size=30][b]КЛІКАЙ![/b][/size]"
-                self.app.click_button.background_normal = ''
-                self.app.click_button.background_down = ''
-                self.app.click_button.background_color = get_color_from_hex('#ffffff')
-            else:  # Зі скіном
-                self.app.click_button.text = ""
-                self.app.click_button.background_normal = self.image_source
-                self.app.click_button.background_down = self.image_source
-                self.app.click_button.background_color = get_color_from_hex('#ffffff')
-
-            for child in self.parent.children:
-                if hasattr(child, 'select_button'):
-                    child.select_button.text = "Обрати"
-            instance.text = "Обрано"
-
-            self.app.save_progress()
-
-
-class ShopScrollView(ScrollView):
-    def __init__(self, app_instance, **kwargs):
-        super().__init__(**kwargs)
-        self.size_hint = (1, 1)
-        self.do_scroll_x = True
-        self.do_scroll_y = False
-        self.bar_width = dp(10)
-
-        self.items_layout = BoxLayout(
-            orientation='horizontal',
-            size_hint=(None, 1),
-            spacing=dp(20),
-            padding=dp(20)
-        )
-        self.items_layout.bind(minimum_width=self.items_layout.setter('width'))
-
-        self.add_widget(self.items_layout)
-        self.app = app_instance
-
-    def add_item(self, image_source, price_text, price, skin_index):
-        item = ShopItem(image_source, price_text, price, self.app, skin_index)
-        self.items_layout.add_widget(item)
+CLICK_BUTTON_SIZE = (dp(CLICK_BUTTON_DP[0]), dp(CLICK_BUTTON_DP[1]))
+SHOP_IMAGE_SIZE = (dp(SHOP_IMAGE_DP[0]), dp(SHOP_IMAGE_DP[1]))
 
 
 class ClickerApp(App):
+    save_interval = 2.0  # як часто (сек) скидати змінений прогрес на диск
+    click_voices = 4  # скільки копій звуку кліку може звучати одночасно
+    click_sounds_per_frame = 3
+    combo_clicks_per_second = 8  # з такого темпу вмикається комбо-буст
+    frenzy_interval = (120, 240)  # пауза між подіями шаленства, сек
+    splash_mode = STARTUP_OPTIONS['splash']  # 'full', 'short' або 'off'
+    startup_log = 'startup.log'
+    profile = STARTUP_OPTIONS['profile']  # --profile або CLICKER_PROFILE=1
+    profile_report = 'profile.json'
+    profiler_hotkey = 293  # F12
+    record_path = STARTUP_OPTIONS['record']  # --record session.trace: записувати дії гравця
+    replay_path = STARTUP_OPTIONS['replay']  # --replay session.trace: відтворити запис і вийти
+    replay_speed = STARTUP_OPTIONS['replay_speed']  # 1 - реальний час, N - швидше, 0 - якнайшвидше
+    replay_save = 'replay.bin'  # під час відтворення save.bin гравця не чіпаємо
+    replay_report = 'replay_report.json'
+    leaderboard_address = STARTUP_OPTIONS['leaderboard']  # --leaderboard HOST:PORT або CLICKER_LEADERBOARD
+    leaderboard_interval = 5.0  # як часто (сек) надсилати пакет змін
+
     def build(self):
         Window.clearcolor = (0, 0, 0, 1)
         Window.bind(on_resize=self.on_window_resize)
 
-        self.music_on = True
-        self.sound_on = True
-        self.current_skin = 0  # 0 - без скіна
-        self.purchased_skins = ['0']  # 0 завжди доступний
-        self.load_progress()
-
-        self.click_sound = SoundLoader.load('click.mp3')
-        self.bg_music = SoundLoader.load('background.mp3')
-        self.music_volume = 0.5
-        self.sound_volume = 1.0
+        # Обгортаємо до створення кнопок і конвеєра кліків, бо вони запам'ятовують обробники.
+        # add_coin лише ставить клік у чергу; сама робота кліку - в apply_clicks
+        self.profiler = Profiler(enabled=self.profile)
+        self.profiler.wrap(self, ['add_coin', 'apply_clicks', 'commit_state', 'save_progress', 'update_balance',
+                                  'show_shop', 'buy_skin', 'select_skin', 'buy_generator'])
+
+        self.engine = GameEngine(tiers=UpgradeTable.load('upgrades.json'),
+                                 income=IncomeEngine(load_generators('catalog.json')))
+        self.state = self.engine.state
+        self.catalog = SkinCatalog.load('catalog.json')
+        self.stats = StatsEngine(load_achievements('catalog.json'), skin_slots=max(self.catalog.by_index) + 1)
+        self.stats.on_unlock = self.on_achievement
+        self.assets = AssetCache()
+        # Текстури кнопки поточного і попереднього скінів тримаються поза LRU-кешем,
+        # щоб перемикання туди-назад не читало файлів; решта - в межах бюджету кешу
+        self.pinned_skins = {}
+        self.pinned_current = None
+        self.loading_skins = {}  # skin_index -> фонове завантаження текстури кнопки
+        self.preloader = None
+        self.shop_popup = None
+        self.settings_popup = None
+        self.save_file = SaveFile(self.replay_save if self.replay_path else 'save.bin')
+        self.saver = SaveManager(self.save_file.path, self.serialize_progress, interval=self.save_interval,
+                                 writer=self.save_file.write)
+        if self.replay_path:
+            self.load_replay()
+        else:
+            self.load_progress()
+        # Запис починається зі знімка стану, щоб відтворення стартувало з того ж місця
+        self.recorder = TraceRecorder(self.record_path, self.serialize_progress()) if self.record_path else None
+        self.store = GameStore()
+        self.store.sync(self.engine)
+
+        self.saver.start()
+        Clock.schedule_interval(self.tick_save, self.save_interval)
+
+        self.leaderboard = None
+        if self.leaderboard_address and not self.replay_path:
+            self.start_leaderboard()
+
+        # Кліки накопичуються і застосовуються одним пакетом на кадр
+        self.click_pipeline = ClickPipeline(self.apply_clicks)
+        if self.replay_path:
+            self.click_pipeline.clock = self.replay_clock
+        self.click_pipeline.schedule = Clock.create_trigger(self.click_pipeline.flush)
+        # Темп кліків і розміри пакетів, уникнуті записи і затримка скидання - у звіті профілювання
+        self.profiler.add_counters('click_pipeline', self.click_pipeline.stats)
+        self.profiler.add_counters('saves', self.saver.stats)
+
+        self.click_sound = VoicePool([])
+        self.bg_music = None
+        self.game_started = False
 
         self.main_layout = FloatLayout()
 
+        # Ігровий інтерфейс будується одразу, але лишається прихованим під заставкою
+        self.game_layout = FloatLayout(opacity=0)
+        self.main_layout.add_widget(self.game_layout)
+        self.create_game_ui()
+
         self.notification = Notification()
         self.main_layout.add_widget(self.notification)
+        self.notifications = NotificationManager(self.notification)
+
+        if self.profiler.enabled:
+            self.start_profiler()
+
+        self.start_preload()
+        Clock.schedule_once(lambda dt: STARTUP.mark('first_frame'))
+        STARTUP.mark('build')
+
+        if self.splash_mode == 'off':
+            Clock.schedule_once(self.init_game)
+            return self.main_layout
 
         self.splash = Image(
             source='splash.png',
@@ -211,15 +171,59 @@ class ClickerApp(App):
             opacity=0
         )
         self.main_layout.add_widget(self.splash)
+
+        self.splash_progress = Label(
+            text="",
+            size_hint=(None, None),
+            size=(dp(300), dp(30)),
+            pos_hint={'center_x': 0.5, 'center_y': 0.2},
+            font_size=dp(16),
+            color=get_color_from_hex('#888888')
+        )
+        self.main_layout.add_widget(self.splash_progress)
+
         self.start_splash_animation()
 
         return self.main_layout
 
+    def start_profiler(self):
+        self.profiler_overlay = Label(
+            text="",
+            size_hint=(None, None),
+            size=(dp(360), dp(200)),
+            pos=(dp(10), dp(70)),
+            font_size=dp(12),
+            halign='left',
+            valign='bottom',
+            color=get_color_from_hex('#42f554'),
+            opacity=0
+        )
+        self.profiler_overlay.text_size = self.profiler_overlay.size
+        self.main_layout.add_widget(self.profiler_overlay)
+        self.profiler_overlay_event = None
+
+        Clock.schedule_interval(self.profiler.on_frame, 0)
+        Window.bind(on_flip=self.profiler.on_flip, on_key_down=self.on_profiler_key)
+        self.click_button.bind(on_press=lambda *args: self.profiler.mark_input())
+
+    def on_profiler_key(self, window, key, *args):
+        if key != self.profiler_hotkey:
+            return False
+        if self.profiler_overlay_event is None:
+            self.profiler_overlay.opacity = 1
+            self.profiler_overlay_event = Clock.schedule_interval(self.update_profiler_overlay, 0.5)
+            self.update_profiler_overlay(0)
+        else:
+            self.profiler_overlay_event.cancel()
+            self.profiler_overlay_event = None
+            self.profiler_overlay.opacity = 0
+        return True
+
+    def update_profiler_overlay(self, dt):
+        self.profiler_overlay.text = self.profiler.overlay_text()
+
     def show_notification(self, text):
-        self.notification.text = text
-        anim = Animation(opacity=1, duration=0.3) + Animation(opacity=1, duration=1.5) + Animation(opacity=0,
-                                                                                                   duration=0.5)
-        anim.start(self.notification)
+        self.notifications.show(text)
 
     def on_window_resize(self, window, width, height):
         if hasattr(self, 'click_button'):
@@ -227,94 +231,315 @@ class ClickerApp(App):
 
     def load_progress(self):
         try:
-            if os.path.exists('xui.txt'):
-                with open('xui.txt', 'r') as f:
-                    data = f.read().strip().split(',')
-                    self.coins = int(data[0]) if len(data) > 0 else 0
-                    self.multiplier = int(data[1]) if len(data) > 1 else 1
-                    self.upgrade_level = int(data[2]) if len(data) > 2 else 0
-                    self.music_volume = float(data[3]) if len(data) > 3 else 0.5
-                    self.sound_volume = float(data[4]) if len(data) > 4 else 1.0
-                    self.current_skin = int(data[5]) if len(data) > 5 else 0  # 0 - без скіна
-                    self.purchased_skins = data[6].split('|') if len(data) > 6 else ['0']  # 0 завжди доступний
+            sections = self.save_file.read()
+            if sections is not None:
+                self.load_sections(sections)
+            elif self.save_file.exists():
+                # Слоти є, але всі пошкоджені: на застарілі xui.txt / progress.json не відкочуємося
+                raise SaveError("усі слоти збереження пошкоджені")
+            else:
+                self.migrate_legacy_progress()
         except Exception as e:
             print(f"Помилка завантаження прогресу: {e}")
-            self.coins = 0
-            self.multiplier = 1
-            self.upgrade_level = 0
-            self.music_volume = 0.5
-            self.sound_volume = 1.0
-            self.current_skin = 0  # Без скіна при першому запуску
-            self.purchased_skins = ['0']  # 0 завжди доступний
+            self.state.reset()  # Без скіна при першому запуску
+            self.engine.income.reset()
+            self.engine.boosts.clear()
+            self.stats.reset()
+        self.engine.refresh()
+
+        # Офлайн-заробіток рахується одразу за весь час відсутності
+        coins_before = self.state.coins
+        self.engine.settle()
+        self.offline_earnings = self.state.coins - coins_before
+
+    def load_sections(self, sections):
+        self.state.load_bytes(sections[b'ST'])
+        if b'IN' in sections:
+            self.engine.income.load_bytes(sections[b'IN'])
+        if b'BO' in sections:
+            self.engine.boosts.load_bytes(sections[b'BO'])
+        if b'SA' in sections:
+            self.stats.load_bytes(sections[b'SA'])
+
+    def load_replay(self):
+        try:
+            sections, events = read_trace(self.replay_path)
+        except Exception as e:
+            print(f"Помилка завантаження запису {self.replay_path}: {e}")
+            sections, events = None, []
+        self.replayer = TraceReplayer(events, self.replay_event, self.replay_speed)
+
+        # Бусти, статистика і конвеєр кліків живуть за часом запису, а не за годинником,
+        # тож комбо, закінчення бустів і дохід не залежать від швидкості відтворення
+        self.engine.boosts.clock = self.replay_clock
+        self.stats.clock = self.replay_clock
+        try:
+            self.load_sections(sections)
+        except Exception as e:
+            if sections is not None:
+                print(f"Помилка завантаження знімка стану: {e}")
+            self.state.reset()
+            self.engine.income.reset()
+            self.engine.boosts.clear()
+            self.stats.reset()
+        # Дохід рахується від моменту запису знімка, тож офлайн-заробітку немає
+        income = self.engine.income
+        origin = income.last_settled
+        income.clock = lambda: origin + self.replay_clock()
+        self.engine.refresh()
+        self.offline_earnings = 0
+
+    def replay_clock(self):
+        return self.replayer.now
+
+    def migrate_legacy_progress(self):
+        # Перенесення зі старих xui.txt / progress.json у save.bin. Після запису save.bin
+        # старий файл перейменовується, щоб більше ніколи не бути джерелом прогресу
+        for path, loader in (('xui.txt', self.state.load_legacy), ('progress.json', self.state.load_json)):
+            if os.path.exists(path) and os.path.getsize(path) > 0:
+                with open(path, 'r') as f:
+                    loader(f.read())
+                self.save_progress()
+                self.saver.flush()
+                os.replace(path, f"{path}.migrated")
+                return
+
+    def tick_save(self, dt):
+        # Не повертаємо результат tick: False від інтервального колбека Kivy сприйняв би як скасування
+        self.saver.tick()
 
     def save_progress(self):
-        data = [
-            str(self.coins),
-            str(self.multiplier),
-            str(self.upgrade_level),
-            str(self.music_volume),
-            str(self.sound_volume),
-            str(self.current_skin),
-            "|".join(self.purchased_skins)
-        ]
-        with open('xui.txt', 'w') as f:
-            f.write(",".join(data))
+        # Лише позначаємо стан зміненим - запис відбудеться пакетно у фоні
+        self.saver.mark_dirty()
+
+    def serialize_progress(self):
+        return {
+            b'ST': self.state.to_bytes(),
+            b'IN': self.engine.income.to_bytes(),
+            b'BO': self.engine.boosts.to_bytes(),
+            b'SA': self.stats.to_bytes()
+        }
+
+    def start_leaderboard(self):
+        # Мережа працює у власному потоці; UI лише передає знімок раз на інтервал
+        host, port = parse_address(self.leaderboard_address)
+        self.leaderboard = LeaderboardClient(host, port, load_player_id('player.id'),
+                                             queue_path='leaderboard.queue', interval=self.leaderboard_interval)
+        self.publish_score()
+        self.leaderboard.start()
+        Clock.schedule_interval(self.publish_score, self.leaderboard_interval)
+
+    def publish_score(self, *args):
+        self.leaderboard.publish({
+            'coins': self.engine.balance(),
+            'upgrade_level': self.state.upgrade_level,
+            'income_rate': self.engine.income.rate,
+            'clicks': self.stats.values[STAT_CLICKS],
+            'peak_cps': self.stats.values[STAT_PEAK_CPS],
+            'skins': len(self.state.purchased_skins()),
+        })
+
+    def start_preload(self):
+        self.preloader = Preloader(lambda callback: Clock.schedule_once(callback))
+        self.preloader.add('click', self.load_click_sound, self.set_click_sound)
+        self.preloader.add('background.mp3', lambda: SoundLoader.load('background.mp3'), self.set_bg_music)
+
+        # Мініатюри і декодування - у фоні; в UI-потоці лише створення текстур з готових пікселів.
+        # Для кнопки - поточний і всі куплені скіни, тож перемикання між ними не читає файлів.
+        for item in self.catalog:
+            self.preloader.add(item.image,
+                               lambda image=item.image: self.assets.decode(image, *SHOP_IMAGE_SIZE),
+                               self.assets.add_decoded)
+        for skin_index in {self.state.current_skin, *self.state.purchased_skins()}:
+            image = self.catalog.button_image(skin_index)
+            if image:
+                self.preloader.add(image, lambda image=image: self.assets.decode(image, *CLICK_BUTTON_SIZE),
+                                   lambda decoded, skin_index=skin_index: self.on_skin_loaded(skin_index, decoded))
+
+        self.preloader.start(on_progress=self.on_preload_progress, on_complete=self.on_preload_complete)
+
+    def load_click_sound(self):
+        return VoicePool.load(SoundLoader.load, size=self.click_voices,
+                              max_per_frame=self.click_sounds_per_frame,
+                              frame_clock=lambda: Clock.frames)
+
+    def set_click_sound(self, pool):
+        self.click_sound = pool
+        pool.set_volume(self.state.sound_volume)
+
+    def set_bg_music(self, sound):
+        self.bg_music = sound
+        if self.game_started:
+            self.start_music()
+
+    def on_preload_progress(self, done, total, name):
+        # Без заставки гра стартує, не чекаючи завантаження, і мітки прогресу немає
+        if not self.game_started and self.splash_mode != 'off':
+            self.splash_progress.text = f"Завантаження... {done * 100 // total}%"
+
+    def on_preload_complete(self):
+        STARTUP.mark('preload')
+        if self.click_button.texture is None and self.catalog.button_image(self.state.current_skin):
+            # Скін не потрапив у попереднє завантаження (помилка або його змінили) - ще одна спроба у фоні
+            self.apply_skin()
+        if not self.game_started and self.splash_mode != 'off':
+            self.maybe_end_splash()
 
     def start_splash_animation(self):
-        anim_in = Animation(opacity=1, duration=1.5)
-        anim_out = Animation(opacity=0, duration=1.5)
-        anim_in.bind(on_complete=lambda *x: Clock.schedule_once(lambda dt: anim_out.start(self.splash), 2))
-        anim_out.bind(on_complete=self.init_game)
+        self.splash_shown = False
+        self.splash_ending = False
+        anim_in = Animation(opacity=1, duration=0.3 if self.splash_mode == 'short' else 1.5)
+        anim_in.bind(on_complete=lambda *x: self.on_splash_shown())
         anim_in.start(self.splash)
+        # Дотик пропускає заставку, навіть якщо завантаження ще триває
+        self.main_layout.bind(on_touch_down=self.skip_splash)
+
+    def on_splash_shown(self):
+        self.splash_shown = True
+        self.maybe_end_splash()
+
+    def maybe_end_splash(self):
+        # Заставка зникає щойно вона показана і всі ресурси завантажено
+        # (коротка заставка не чекає на завантаження)
+        if self.splash_shown and (self.preloader.finished or self.splash_mode == 'short'):
+            self.end_splash()
+
+    def end_splash(self):
+        if self.splash_ending:
+            return
+        self.splash_ending = True
+        anim_out = Animation(opacity=0, duration=0.2 if self.splash_mode == 'short' else 0.5)
+        anim_out.bind(on_complete=self.init_game)
+        anim_out.start(self.splash)
+
+    def skip_splash(self, *args):
+        if self.splash_ending:
+            return
+        self.splash_ending = True
+        Animation.cancel_all(self.splash)
+        self.init_game()
+        return True
 
     def init_game(self, *args):
+        if self.game_started:
+            return
+        self.game_started = True
         self.showing_splash = False
         Window.clearcolor = get_color_from_hex('#2d2d2d')
-        self.main_layout.remove_widget(self.splash)
-
+        if self.splash_mode != 'off':
+            self.main_layout.unbind(on_touch_down=self.skip_splash)
+            self.main_layout.remove_widget(self.splash)
+            self.main_layout.remove_widget(self.splash_progress)
+
+        self.game_layout.opacity = 1
+        self.start_music()
+
+        if self.offline_earnings > 0:
+            self.show_notification(f"[b]Офлайн дохід: +{format_compact(self.offline_earnings)}[/b]")
+
+        STARTUP.mark('interactive')
+        Clock.schedule_once(lambda dt: STARTUP.write(self.startup_log, splash=self.splash_mode))
+
+        if self.replay_path:
+            self.start_replay()
+
+    def record(self, kind, arg=0):
+        if self.recorder is not None:
+            self.recorder.record(kind, arg)
+
+    def start_replay(self):
+        self.replay_handlers = {
+            EVENT_CLICK: self.replay_click,
+            EVENT_BUY_SKIN: self.buy_skin,
+            EVENT_SELECT_SKIN: self.select_skin,
+            EVENT_BUY_GENERATOR: self.buy_generator,
+            EVENT_MUSIC_ON: lambda arg: self.set_music(bool(arg)),
+            EVENT_SOUND_ON: lambda arg: self.set_sound(bool(arg)),
+            EVENT_MUSIC_VOLUME: lambda arg: self.set_music_volume(arg / 1000),
+            EVENT_SOUND_VOLUME: lambda arg: self.set_sound_volume(arg / 1000),
+            EVENT_FRENZY: self.frenzy,
+        }
+        self.replay_started = time.perf_counter()
+        Clock.schedule_interval(self.step_replay, 0)
+
+    def replay_event(self, kind, arg):
+        # Бусти спливають і час гри рахується в ті ж моменти запису, що й у сесії гравця
+        if self.engine.boosts.expire():
+            self.commit_state()
+        self.stats.tick()
+        handler = self.replay_handlers.get(kind)
+        if handler is not None:
+            handler(arg)
+
+    def replay_click(self, arg):
+        self.profiler.mark_input()
+        self.add_coin(self.click_button)
+        # Клік застосовується в мить запису, а не пакетом кадру - інакше розмір пакетів,
+        # а з ним і комбо, залежали б від швидкості відтворення
+        self.click_pipeline.flush()
+
+    def step_replay(self, dt):
+        self.replayer.advance(dt)
+        if self.replayer.done:
+            self.engine.settle()
+            self.stats.tick()
+            self.finish_replay()
+            return False
+
+    def finish_replay(self):
+        self.saver.flush()  # останній запис - до звіту, щоб лічильники збережень були повні
+        s = self.state
+        report = {
+            'trace': self.replay_path,
+            'events': len(self.replayer.events),
+            'speed': self.replay_speed,
+            'trace_seconds': self.replayer.duration,
+            'wall_seconds': time.perf_counter() - self.replay_started,
+            'frames': self.replayer.frames,
+            'final_state': {
+                'coins': s.coins,
+                'upgrade_level': s.upgrade_level,
+                'multiplier': s.multiplier,
+                'current_skin': s.current_skin,
+                'purchased_skins': s.purchased_skins(),
+                'generators': {str(gid): count for gid, count in self.engine.income.owned.items()},
+                'music_on': s.music_on,
+                'sound_on': s.sound_on,
+                'music_volume': s.music_volume,
+                'sound_volume': s.sound_volume,
+            },
+            'stats': self.stats.summary(),
+            'profile': self.profiler.report(),
+        }
+        with open(self.replay_report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Відтворення завершено, звіт у {self.replay_report}")
+        self.stop()
+
+    def start_music(self):
         if self.bg_music:
             self.bg_music.loop = True
-            self.bg_music.volume = self.music_volume
-            if self.music_on:
+            self.bg_music.volume = self.state.music_volume
+            if self.state.music_on:
                 self.bg_music.play()
 
-        self.create_game_ui()
-
     def create_game_ui(self):
-        skin_colors = [
-            '#f5a742',  # колір за замовчуванням (без скіна)
-            '#ffffff',  # зелений (1)
-            '#ffffff',  # блакитний (2)
-            '#ffffff'  # рожевий (3)
-        ]
-
-        skin_images = [
-            None,  # без скіна (0) - тут None
-            'item1.png',  # зелений (1)
-            'item2.png',  # блакитний (2)
-            'item3.png'  # рожевий (3)
-        ]
-
-        # Якщо current_skin = 0 (без скіна), то не використовуємо фото
-        current_skin_image = skin_images[self.current_skin] if self.current_skin > 0 else None
-
-        self.click_button = Button(
-            text="[size=30][b]КЛІКАЙ![/b][/size]" if self.current_skin == 0 else "",
-            markup=True,
+        self.click_button = ClickButton(
             size_hint=(None, None),
-            size=(dp(250), dp(250)),
+            size=CLICK_BUTTON_SIZE,
             pos_hint={'center_x': 0.5, 'center_y': 0.5},
-            background_color=get_color_from_hex(skin_colors[0]),  # Колір за замовчуванням
-            background_normal=current_skin_image if self.current_skin > 0 else '',
-            background_down=current_skin_image if self.current_skin > 0 else '',
-            color=get_color_from_hex('#000000'),
-            bold=True,
             on_press=self.add_coin
         )
-        self.main_layout.add_widget(self.click_button)
+        self.apply_skin()
+        self.game_layout.add_widget(self.click_button)
+
+        # Ефекти поверх кнопки; дотики проходять крізь шар до кнопки
+        self.effects = EffectsLayer()
+        self.game_layout.add_widget(self.effects)
 
+        self.coin_display = CompactDisplay()
         self.balance_label = Label(
-            text=f"[size=30][b]Монети:[/b] {self.coins}[/size]",
+            text=f"[size=30][b]Монети:[/b] {self.coin_display.update(self.state.coins)}[/size]",
             markup=True,
             color=get_color_from_hex('#ffffff'),
             size_hint=(None, None),
@@ -323,32 +548,59 @@ class ClickerApp(App):
             halign='left',
             valign='top'
         )
-        self.main_layout.add_widget(self.balance_label)
+        self.game_layout.add_widget(self.balance_label)
+
+        self.income_label = Label(
+            text="",
+            color=get_color_from_hex('#42f554'),
+            size_hint=(None, None),
+            size=(dp(300), dp(30)),
+            pos=(dp(10), Window.height - dp(90)),
+            font_size=dp(18),
+            halign='left',
+            valign='top'
+        )
+        self.update_income_label()
+        self.game_layout.add_widget(self.income_label)
 
+        tier = self.engine.current_tier()
         self.multiplier_label = Label(
-            text="x2!" if self.upgrade_level >= 1 else "x3!" if self.upgrade_level >= 2 else "",
+            text=f"[size=40][b]{tier.label}[/b][/size]" if tier else "",
             markup=True,
-            color=get_color_from_hex('#42f554' if self.upgrade_level == 1 else '#42a1f5'),
+            color=get_color_from_hex(tier.color if tier else '#ffffff'),
             size_hint=(None, None),
             size=(dp(100), dp(50)),
             pos_hint={'center_x': 0.5},
             y=Window.height / 2 + dp(180),
-            opacity=1 if self.upgrade_level > 0 else 0
+            opacity=1 if self.state.upgrade_level > 0 else 0
+        )
+        self.game_layout.add_widget(self.multiplier_label)
+
+        self.boost_label = Label(
+            text="",
+            markup=True,
+            color=get_color_from_hex('#f5e642'),
+            size_hint=(None, None),
+            size=(dp(200), dp(30)),
+            pos_hint={'center_x': 0.5},
+            y=Window.height / 2 + dp(150),
+            font_size=dp(20)
         )
-        self.main_layout.add_widget(self.multiplier_label)
+        self.update_boost_label()
+        self.game_layout.add_widget(self.boost_label)
 
         self.music_button = Button(
-            text="♫" if self.music_on else "🔇",
+            text="♫" if self.state.music_on else "🔇",
             size_hint=(None, None),
             size=(dp(50), dp(50)),
             pos_hint={'right': 0.98, 'y': 0.02},
-            background_color=get_color_from_hex('#444444') if self.music_on else get_color_from_hex('#ff0000'),
+            background_color=get_color_from_hex('#444444') if self.state.music_on else get_color_from_hex('#ff0000'),
             background_normal='',
             color=get_color_from_hex('#ffffff'),
             font_size=dp(30),
             on_press=self.toggle_music
         )
-        self.main_layout.add_widget(self.music_button)
+        self.game_layout.add_widget(self.music_button)
 
         self.settings_button = Button(
             text="Налаштування",
@@ -361,7 +613,7 @@ class ClickerApp(App):
             font_size=dp(20),
             on_press=self.show_settings
         )
-        self.main_layout.add_widget(self.settings_button)
+        self.game_layout.add_widget(self.settings_button)
 
         self.shop_button = Button(
             text="Магазин",
@@ -374,9 +626,162 @@ class ClickerApp(App):
             font_size=dp(20),
             on_press=self.show_shop
         )
-        self.main_layout.add_widget(self.shop_button)
+        self.game_layout.add_widget(self.shop_button)
+
+        self.bind_store()
+        # Раз на секунду лише оновлюємо показ балансу; сам дохід рахується за формулою
+        Clock.schedule_interval(self.tick_income, 1.0)
+
+        self.boost_event = None
+        self.arm_boost_timer()
+        # Під час відтворення шаленство настає лише там, де воно є в записі
+        if not self.replay_path:
+            Clock.schedule_once(self.start_frenzy, random.uniform(*self.frenzy_interval))
+
+    def bind_store(self):
+        self.shown_skin = self.store.current_skin
+        self.store.bind(
+            coins=lambda *args: self.update_balance(),
+            upgrade_level=lambda *args: self.unlock_upgrade(),
+            current_skin=self.on_current_skin,
+            music_on=self.on_music_on,
+            sound_on=self.on_sound_on,
+            music_volume=self.on_music_volume,
+            sound_volume=self.on_sound_volume,
+            income_rate=lambda *args: self.update_income_label(),
+            boost_factor=lambda *args: self.update_boost_label()
+        )
+
+    def commit_state(self):
+        # Після кожної зміни стану: віджети оновлюються через прив'язки, прогрес зберігається
+        self.store.sync(self.engine)
+        self.save_progress()
+
+    def tick_income(self, dt):
+        if not self.replay_path:  # під час відтворення час гри рахує replay_event
+            self.stats.tick()
+        if self.engine.income.rate:
+            self.engine.settle()
+            self.store.sync(self.engine)
+
+    def start_boost(self, factor, duration, kind, text):
+        self.engine.boosts.add(factor, duration, kind)
+        self.commit_state()
+        self.arm_boost_timer()
+        self.show_notification(f"[b]{text}[/b]")
+
+    def arm_boost_timer(self):
+        # Один таймер на найближче закінчення замість окремого таймера на кожен буст
+        if self.boost_event is not None:
+            self.boost_event.cancel()
+            self.boost_event = None
+        time_left = self.engine.boosts.time_left()
+        if time_left is not None:
+            self.boost_event = Clock.schedule_once(self.on_boost_timer, time_left)
+
+    def on_boost_timer(self, dt):
+        self.boost_event = None
+        if self.engine.boosts.expire():
+            self.commit_state()
+        self.arm_boost_timer()
+
+    def start_frenzy(self, dt):
+        self.frenzy()
+        Clock.schedule_once(self.start_frenzy, random.uniform(*self.frenzy_interval))
+
+    def frenzy(self, *args):
+        self.record(EVENT_FRENZY)
+        self.start_boost(3, 15, BOOST_FRENZY, "Шаленство! x3 на 15 сек")
+
+    def update_boost_label(self):
+        factor = self.engine.boosts.factor
+        self.boost_label.text = f"[b]БУСТ x{factor}[/b]" if factor > 1 else ""
+
+    def update_income_label(self):
+        rate = self.engine.income.rate
+        self.income_label.text = f"+{format_compact(rate)} монет/сек" if rate else ""
+
+    def on_current_skin(self, store, skin_index):
+        self.apply_skin()
+        # Оновлюємо лише стару і нову картки, без обходу всього магазину
+        if self.shop_popup is not None:
+            self.shop_view.refresh_card(self.shown_skin)
+            self.shop_view.refresh_card(skin_index)
+        self.shown_skin = skin_index
+
+    def on_music_on(self, store, music_on):
+        if self.bg_music:
+            if music_on:
+                self.bg_music.play()
+            else:
+                self.bg_music.stop()
+        self.music_button.text = "♫" if music_on else "🔇"
+        self.music_button.background_color = get_color_from_hex('#444444' if music_on else '#ff0000')
+        if self.settings_popup is not None:
+            self.music_toggle.text = "Увімк." if music_on else "Вимк."
+            self.music_toggle.background_color = get_color_from_hex('#42f554' if music_on else '#ff0000')
+
+    def on_sound_on(self, store, sound_on):
+        if self.settings_popup is not None:
+            self.sound_toggle.text = "Увімк." if sound_on else "Вимк."
+            self.sound_toggle.background_color = get_color_from_hex('#42f554' if sound_on else '#ff0000')
+
+    def on_music_volume(self, store, value):
+        if self.bg_music:
+            self.bg_music.volume = value
+
+    def on_sound_volume(self, store, value):
+        self.click_sound.set_volume(value)
+
+    def apply_skin(self):
+        # Якщо current_skin = 0 (без скіна), то не використовуємо фото
+        skin_index = self.state.current_skin
+        color = self.catalog.button_color(skin_index)
+        if not self.catalog.button_image(skin_index):
+            self.click_button.set_skin(None, color)
+            return
+        texture = self.skin_texture(skin_index)
+        if texture is not None:
+            self.pin_skin(skin_index, texture)
+        elif self.preloader is not None:
+            self.request_skin(skin_index)
+        # Поки текстура вантажиться - заглушка кольору скіна; скін застосує on_skin_loaded
+        self.click_button.set_skin(texture, color, caption=False)
+
+    def skin_texture(self, skin_index):
+        # Лише текстури, вже наявні в пам'яті: UI-потік файлів не читає
+        texture = self.pinned_skins.get(skin_index)
+        if texture is None:
+            texture = self.assets.cached_texture(self.catalog.button_image(skin_index), *CLICK_BUTTON_SIZE)
+        return texture
+
+    def request_skin(self, skin_index):
+        # Текстуру витіснено з кешу або скін щойно куплено - вантажимо у фоні, як і при старті
+        pending = self.loading_skins.get(skin_index)
+        if pending is not None and not pending.done():
+            return
+        image = self.catalog.button_image(skin_index)
+        self.loading_skins[skin_index] = self.preloader.load_later(
+            image, lambda: self.assets.decode(image, *CLICK_BUTTON_SIZE),
+            lambda decoded: self.on_skin_loaded(skin_index, decoded))
+
+    def pin_skin(self, skin_index, texture):
+        if skin_index != self.pinned_current:
+            # Лишаємо попередній скін, старіші віддаємо LRU-кешу
+            self.pinned_skins = {i: t for i, t in self.pinned_skins.items() if i == self.pinned_current}
+            self.pinned_current = skin_index
+        self.pinned_skins[skin_index] = texture
+
+    def on_skin_loaded(self, skin_index, decoded):
+        self.loading_skins.pop(skin_index, None)
+        self.assets.add_decoded(decoded)
+        if skin_index == self.state.current_skin:
+            self.apply_skin()
+
+    def build_shop(self):
+        from kivy.uix.popup import Popup
+        from shop import ShopRecycleView
 
-    def show_shop(self, instance):
         content = BoxLayout(orientation='vertical', spacing=dp(10), padding=dp(10))
 
         title = Label(
@@ -387,15 +792,9 @@ class ClickerApp(App):
         )
         content.add_widget(title)
 
-        scroll_view = ShopScrollView(self)
-
-        scroll_view.add_item('item1.png', '25,000 монет', 25000, 1)
-        scroll_view.add_item('item2.png', '35,000 монет', 35000, 2)
-        scroll_view.add_item('item3.png', '50,000 монет', 50000, 3)
-        scroll_view.add_item('item4.png', 'БЕЗЦІННИЙ!', 0,
-                             0)  # Тут item4.png використовується тільки для відображення в магазині
-
-        content.add_widget(scroll_view)
+        self.shop_view = ShopRecycleView()
+        self.shop_view.set_catalog(self.catalog, self.engine.income.generators.values())
+        content.add_widget(self.shop_view)
 
         close_btn = Button(
             text="Закрити",
@@ -413,17 +812,30 @@ class ClickerApp(App):
             auto_dismiss=False,
             separator_height=0
         )
+
+    def show_shop(self, instance):
+        # Магазин будується один раз; картки оновлюються через прив'язки до стану
+        if self.shop_popup is None:
+            self.build_shop()
         self.shop_popup.open()
 
     def show_settings(self, instance):
+        if self.settings_popup is None:
+            self.build_settings()
+        self.settings_popup.open()
+
+    def build_settings(self):
+        from kivy.uix.popup import Popup
+        from kivy.uix.slider import Slider
+
         content = BoxLayout(orientation='vertical', spacing=dp(10), padding=dp(20))
 
         music_box = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(50))
         music_box.add_widget(Label(text="Музика:", size_hint_x=0.4))
         self.music_toggle = Button(
-            text="Увімк." if self.music_on else "Вимк.",
+            text="Увімк." if self.state.music_on else "Вимк.",
             background_normal='',
-            background_color=get_color_from_hex('#42f554' if self.music_on else '#ff0000'),
+            background_color=get_color_from_hex('#42f554' if self.state.music_on else '#ff0000'),
             on_press=self.toggle_music_setting
         )
         music_box.add_widget(self.music_toggle)
@@ -431,7 +843,7 @@ class ClickerApp(App):
 
         music_vol_box = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(50))
         music_vol_box.add_widget(Label(text="Гучність музики:", size_hint_x=0.4))
-        self.music_slider = Slider(min=0, max=1, value=self.music_volume, step=0.1)
+        self.music_slider = Slider(min=0, max=1, value=self.state.music_volume, step=0.1)
         self.music_slider.bind(value=self.update_music_volume)
         music_vol_box.add_widget(self.music_slider)
         content.add_widget(music_vol_box)
@@ -439,9 +851,9 @@ class ClickerApp(App):
         sound_box = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(50))
         sound_box.add_widget(Label(text="Звуки:", size_hint_x=0.4))
         self.sound_toggle = Button(
-            text="Увімк." if self.sound_on else "Вимк.",
+            text="Увімк." if self.state.sound_on else "Вимк.",
             background_normal='',
-            background_color=get_color_from_hex('#42f554' if self.sound_on else '#ff0000'),
+            background_color=get_color_from_hex('#42f554' if self.state.sound_on else '#ff0000'),
             on_press=self.toggle_sound_setting
         )
         sound_box.add_widget(self.sound_toggle)
@@ -449,7 +861,7 @@ class ClickerApp(App):
 
         sound_vol_box = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(50))
         sound_vol_box.add_widget(Label(text="Гучність звуків:", size_hint_x=0.4))
-        self.sound_slider = Slider(min=0, max=1, value=self.sound_volume, step=0.1)
+        self.sound_slider = Slider(min=0, max=1, value=self.state.sound_volume, step=0.1)
         self.sound_slider.bind(value=self.update_sound_volume)
         sound_vol_box.add_widget(self.sound_slider)
         content.add_widget(sound_vol_box)
@@ -470,97 +882,157 @@ class ClickerApp(App):
             size_hint=(0.8, 0.8),
             auto_dismiss=False
         )
-        self.settings_popup.open()
 
     def toggle_music_setting(self, instance):
-        self.music_on = not self.music_on
-        instance.text = "Увімк." if self.music_on else "Вимк."
-        instance.background_color = get_color_from_hex('#42f554' if self.music_on else '#ff0000')
-
-        if self.bg_music:
-            if self.music_on:
-                self.bg_music.play()
-                self.music_button.text = "Викл звук"
-                self.music_button.background_color = get_color_from_hex('#444444')
-            else:
-                self.bg_music.stop()
-                self.music_button.text = "Вкл звук"
-                self.music_button.background_color = get_color_from_hex('#ff0000')
-
-        self.save_progress()
+        self.toggle_music(instance)
 
     def toggle_sound_setting(self, instance):
-        self.sound_on = not self.sound_on
-        instance.text = "Увімк." if self.sound_on else "Вимк."
-        instance.background_color = get_color_from_hex('#42f554' if self.sound_on else '#ff0000')
-        self.save_progress()
+        self.set_sound(not self.state.sound_on)
 
     def update_music_volume(self, instance, value):
-        self.music_volume = value
-        if self.bg_music:
-            self.bg_music.volume = value
-        self.save_progress()
+        self.set_music_volume(value)
 
     def update_sound_volume(self, instance, value):
-        self.sound_volume = value
-        if self.click_sound:
-            self.click_sound.volume = value
-        self.save_progress()
+        self.set_sound_volume(value)
+
+    # Дії гравця. Кнопки магазину і налаштувань, а також відтворення запису викликають саме їх.
+    def buy_skin(self, skin_index):
+        self.record(EVENT_BUY_SKIN, skin_index)
+        item = self.catalog.by_index.get(skin_index)
+        if item is None:
+            return False
+        purchased = self.state.is_purchased(skin_index)
+        if not self.engine.buy_skin(skin_index, item.price):
+            self.show_notification("[b]Недостатньо коштів![/b]")
+            return False
+        if not purchased:
+            self.stats.buy_skin(skin_index, item.price)
+            if self.leaderboard is not None:
+                self.leaderboard.record({'type': 'skin', 'id': skin_index, 'price': item.price})
+        self.engine.select_skin(skin_index)
+        self.commit_state()
+        return True
+
+    def select_skin(self, skin_index):
+        self.record(EVENT_SELECT_SKIN, skin_index)
+        if not self.engine.select_skin(skin_index):
+            return False
+        self.commit_state()
+        return True
+
+    def buy_generator(self, generator_id):
+        self.record(EVENT_BUY_GENERATOR, generator_id)
+        if generator_id not in self.engine.income.generators:
+            return False
+        price = self.engine.income.price(generator_id)
+        if not self.engine.buy_generator(generator_id):
+            self.show_notification("[b]Недостатньо коштів![/b]")
+            return False
+        self.stats.buy_generator(price)
+        if self.leaderboard is not None:
+            self.leaderboard.record({'type': 'generator', 'id': generator_id, 'price': price})
+        self.commit_state()
+        return True
+
+    def set_music(self, music_on):
+        self.record(EVENT_MUSIC_ON, int(music_on))
+        self.state.music_on = music_on
+        self.commit_state()
+
+    def set_sound(self, sound_on):
+        self.record(EVENT_SOUND_ON, int(sound_on))
+        self.state.sound_on = sound_on
+        self.commit_state()
+
+    def set_music_volume(self, value):
+        self.record(EVENT_MUSIC_VOLUME, round(value * 1000))
+        self.state.music_volume = value
+        self.commit_state()
+
+    def set_sound_volume(self, value):
+        self.record(EVENT_SOUND_VOLUME, round(value * 1000))
+        self.state.sound_volume = value
+        self.commit_state()
 
     def update_ui_layout(self):
         self.balance_label.pos = (dp(10), Window.height - dp(60))
+        self.income_label.pos = (dp(10), Window.height - dp(90))
         self.multiplier_label.y = Window.height / 2 + dp(180)
+        self.boost_label.y = Window.height / 2 + dp(150)
         self.click_button.pos_hint = {'center_x': 0.5, 'center_y': 0.5}
         self.music_button.pos_hint = {'right': 0.98, 'y': 0.02}
         self.settings_button.pos_hint = {'right': 0.98, 'top': 0.98}
         self.shop_button.pos_hint = {'x': 0.02, 'y': 0.02}
 
     def add_coin(self, instance):
-        if self.sound_on and self.click_sound:
-            self.click_sound.play()
+        if self.recorder is not None:
+            self.recorder.record(EVENT_CLICK)
+        self.click_pipeline.push()
 
-        self.coins += self.multiplier
-        self.update_balance()
+    def apply_clicks(self, count):
+        if self.state.sound_on:
+            self.click_sound.play(count)
 
-        if self.coins >= 10000 and self.upgrade_level < 3:
-            self.unlock_upgrade(4, "x4!", '#28fc03')
-        elif self.coins >= 1000 and self.upgrade_level < 2:
-            self.unlock_upgrade(3, "x3!", '#42a1f5')
-        elif self.coins >= 250 and self.upgrade_level < 1:
-            self.unlock_upgrade(2, "x2!", '#42f554')
+        self.engine.settle()
+        if (self.click_pipeline.clicks_per_second() >= self.combo_clicks_per_second
+                and not self.engine.boosts.is_active(BOOST_COMBO)):
+            self.start_boost(2, 5, BOOST_COMBO, "Комбо! x2 на 5 сек")
 
-        self.save_progress()
+        coins_before = self.state.coins
+        self.engine.click(count)
+        gained = self.state.coins - coins_before
+        self.stats.add_clicks(count, gained)
+        self.commit_state()
+
+        x, top = self.click_button.center_x, self.click_button.top
+        self.effects.spawn(x + random.uniform(-dp(60), dp(60)), top - random.uniform(dp(20), dp(60)),
+                           f"+{format_compact(gained)}", '#f5e642')
 
     def update_balance(self):
-        self.balance_label.text = f"[size=30][b]Монети:[/b] {self.coins}[/size]"
+        # Мітка перерисовується лише коли змінюється показаний рядок ("1.2K" тощо)
+        text = self.coin_display.update(self.state.coins)
+        if text is not None:
+            self.balance_label.text = f"[size=30][b]Монети:[/b] {text}[/size]"
 
-    def unlock_upgrade(self, new_multiplier, text, color):
-        self.multiplier = new_multiplier
-        self.upgrade_level += 1
-        self.multiplier_label.text = f"[size=40][b]{text}[/b][/size]"
-        self.multiplier_label.color = get_color_from_hex(color)
+    def unlock_upgrade(self):
+        tier = self.engine.current_tier()
+        self.multiplier_label.text = f"[size=40][b]{tier.label}[/b][/size]"
+        self.multiplier_label.color = get_color_from_hex(tier.color)
 
         # Просто показуємо мітку з множником без анімації кнопки
         anim = Animation(opacity=1, duration=0.5)
         anim.start(self.multiplier_label)
 
-        self.save_progress()
-
     def toggle_music(self, instance):
-        self.music_on = not self.music_on
-        if self.bg_music:
-            if self.music_on:
-                self.bg_music.play()
-                instance.text = "♫"
-                instance.background_color = get_color_from_hex('#444444')
-            else:
-                self.bg_music.stop()
-                instance.text = "🔇"
-                instance.background_color = get_color_from_hex('#ff0000')
-        self.save_progress()
+        self.set_music(not self.state.music_on)
+
+    def on_achievement(self, achievement):
+        self.show_notification(f"[b]Досягнення: {achievement.name}[/b]")
+
+    def on_pause(self):
+        self.stats.tick()
+        self.engine.settle()
+        self.commit_state()
+        self.saver.flush()
+        return True
+
+    def on_resume(self):
+        self.stats.resume()
+        self.engine.settle()
+        self.commit_state()
 
     def on_stop(self):
+        self.stats.tick()
+        self.engine.settle()
         self.save_progress()
+        self.saver.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.leaderboard is not None:
+            self.publish_score()
+            self.leaderboard.stop()
+        if self.profiler.enabled:
+            self.profiler.dump(self.profile_report)
         if self.bg_music:
             self.bg_music.stop()
 
@@ -0,0 +1,120 @@
+# Черга сповіщень: однакові повідомлення зливаються в одне з лічильником (×5),
+# часті повтори відкидаються, а показ керується одним автоматом станів
+# замість нової Animation на кожен виклик.
+from collections import deque
+import time
+
+from kivy.clock import Clock
+
+IDLE, FADE_IN, HOLD, FADE_OUT = range(4)
+
+
+class NotificationQueue:
+    def __init__(self, max_size=5, cooldown=1.0, clock=time.monotonic):
+        self.max_size = max_size
+        self.cooldown = cooldown  # скільки після показу ігнорувати те саме повідомлення
+        self.clock = clock
+        self.current = None  # [текст, кількість]
+        self.pending = deque()
+        self.counts = {}  # текст -> запис у черзі або поточний
+        self.last_shown = {}
+        self.received = 0
+        self.collapsed = 0
+        self.suppressed = 0
+
+    def push(self, text):
+        # Повертає True, якщо змінився поточний показ (треба оновити текст)
+        self.received += 1
+        entry = self.counts.get(text)
+        if entry is not None:
+            entry[1] += 1
+            self.collapsed += 1
+            return entry is self.current
+
+        shown = self.last_shown.get(text)
+        if shown is not None and self.clock() - shown < self.cooldown:
+            self.suppressed += 1
+            return False
+
+        if len(self.pending) >= self.max_size:
+            dropped = self.pending.popleft()
+            del self.counts[dropped[0]]
+            self.suppressed += dropped[1]
+        entry = [text, 1]
+        self.pending.append(entry)
+        self.counts[text] = entry
+        return False
+
+    def next(self):
+        self.finish()
+        if self.pending:
+            self.current = self.pending.popleft()
+        return self.current
+
+    def finish(self):
+        if self.current is not None:
+            text = self.current[0]
+            del self.counts[text]
+            self.last_shown[text] = self.clock()
+            self.current = None
+
+    @staticmethod
+    def display_text(entry):
+        text, count = entry
+        return f"{text} ×{count}" if count > 1 else text
+
+
+class NotificationManager:
+    def __init__(self, label, fade_in=0.3, hold=1.5, fade_out=0.5, **queue_kwargs):
+        self.label = label
+        self.durations = {FADE_IN: fade_in, HOLD: hold, FADE_OUT: fade_out}
+        self.queue = NotificationQueue(**queue_kwargs)
+        self.phase = IDLE
+        self.elapsed = 0.0
+        self._event = None
+
+    def show(self, text):
+        if self.queue.push(text):
+            # Те саме повідомлення ще на екрані - оновлюємо лічильник і продовжуємо показ
+            self.label.text = self.queue.display_text(self.queue.current)
+            if self.phase in (HOLD, FADE_OUT):
+                self._enter(HOLD)
+                self.label.opacity = 1
+        if self.phase == IDLE:
+            self._show_next()
+
+    def _show_next(self):
+        entry = self.queue.next()
+        if entry is None:
+            self.phase = IDLE
+            self.label.opacity = 0
+            return False
+        self.label.text = self.queue.display_text(entry)
+        self._enter(FADE_IN)
+        if self._event is None:
+            self._event = Clock.schedule_interval(self._update, 0)
+        return True
+
+    def _enter(self, phase):
+        self.phase = phase
+        self.elapsed = 0.0
+
+    def _update(self, dt):
+        self.elapsed += dt
+        duration = self.durations[self.phase]
+        progress = min(1.0, self.elapsed / duration) if duration else 1.0
+
+        if self.phase == FADE_IN:
+            self.label.opacity = progress
+        elif self.phase == FADE_OUT:
+            self.label.opacity = 1 - progress
+        if progress < 1.0:
+            return None
+
+        if self.phase == FADE_IN:
+            self._enter(HOLD)
+        elif self.phase == HOLD:
+            self._enter(FADE_OUT)
+        elif not self._show_next():
+            self._event = None
+            return False
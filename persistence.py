@@ -0,0 +1,130 @@
+# Відкладене (write-behind) збереження прогресу.
+# Стан лише позначається "брудним", а запис на диск відбувається рідше:
+# знімок стану робиться в UI-потоці (tick), а сам запис - у фоновому потоці.
+import os
+import tempfile
+import threading
+import time
+
+
+def atomic_write(path, data, fsync=False):
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class SaveManager:
+    def __init__(self, path, serializer, interval=2.0, fsync=False, writer=None):
+        self.path = path
+        self.serializer = serializer
+        self.interval = interval
+        self.fsync = fsync
+        # writer(data) замінює запис у path (наприклад, SaveFile.write зі слотами)
+        self.writer = writer or (lambda data: atomic_write(self.path, data, self.fsync))
+
+        self.dirty = False
+        self.save_requests = 0
+        self.writes = 0
+        self.writes_avoided = 0
+        self.last_flush_latency = 0.0
+        self.max_flush_latency = 0.0
+        self.total_flush_latency = 0.0
+
+        self._pending = None
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name='SaveManager', daemon=True)
+            self._thread.start()
+
+    def mark_dirty(self):
+        self.save_requests += 1
+        self.dirty = True
+
+    def tick(self, *args):
+        # Викликається з UI-потоку: робимо знімок і передаємо його писачу.
+        # Повертає, чи був запис; для Clock.schedule_interval загортати, бо False скасує інтервал
+        if not self.dirty:
+            return False
+        self.dirty = False
+        data = self.serializer()
+        with self._pending_lock:
+            self._pending = data
+        if self._thread is None:
+            self._write_pending()
+        else:
+            self._wake.set()
+        return True
+
+    def flush(self):
+        # Примусовий синхронний запис (on_stop / on_pause)
+        if self.dirty:
+            self.dirty = False
+            data = self.serializer()
+            with self._pending_lock:
+                self._pending = data
+        return self._write_pending()
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def stats(self):
+        return {
+            'save_requests': self.save_requests,
+            'writes': self.writes,
+            'writes_avoided': self.writes_avoided,
+            'last_flush_latency': self.last_flush_latency,
+            'max_flush_latency': self.max_flush_latency,
+            'avg_flush_latency': self.total_flush_latency / self.writes if self.writes else 0.0,
+        }
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait()
+            self._wake.clear()
+            try:
+                self._write_pending()
+            except OSError as e:
+                print(f"Помилка збереження прогресу: {e}")
+
+    def _write_pending(self):
+        with self._write_lock:
+            with self._pending_lock:
+                data = self._pending
+                self._pending = None
+            if data is None:
+                return False
+
+            start = time.perf_counter()
+            self.writer(data)
+            latency = time.perf_counter() - start
+
+            self.writes += 1
+            self.writes_avoided = max(0, self.save_requests - self.writes)
+            self.last_flush_latency = latency
+            self.max_flush_latency = max(self.max_flush_latency, latency)
+            self.total_flush_latency += latency
+            return True
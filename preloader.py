@@ -0,0 +1,71 @@
+# Фонове попереднє завантаження ресурсів під час заставки.
+# Важка робота (читання файлів, декодування) виконується в пулі потоків,
+# а результати повертаються в UI-потік через dispatch (Clock.schedule_once).
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Preloader:
+    def __init__(self, dispatch, max_workers=4):
+        self.dispatch = dispatch
+        self.max_workers = max_workers
+        self.tasks = []
+        self.done = 0
+        self.failed = []
+        self.finished = False
+        self.on_progress = None
+        self.on_complete = None
+        self._executor = None
+        self._late_executor = None
+
+    @property
+    def total(self):
+        return len(self.tasks)
+
+    def add(self, name, load, apply=None):
+        # load виконується у фоновому потоці, apply(результат) - в UI-потоці
+        self.tasks.append((name, load, apply))
+
+    def load_later(self, name, load, apply=None):
+        # Завантаження поза початковим списком (наприклад, скін, обраний уже в грі):
+        # так само у фоні з поверненням в UI-потік, але без впливу на прогрес заставки
+        if self._late_executor is None:
+            self._late_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='Preloader')
+        future = self._late_executor.submit(load)
+        future.add_done_callback(lambda f: self.dispatch(lambda *args: self._apply(name, apply, f)))
+        return future
+
+    def start(self, on_progress=None, on_complete=None):
+        self.on_progress = on_progress
+        self.on_complete = on_complete
+        if not self.tasks:
+            self.finished = True
+            self.dispatch(lambda *args: self._complete())
+            return
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='Preloader')
+        for task in self.tasks:
+            future = self._executor.submit(task[1])
+            future.add_done_callback(lambda f, task=task: self.dispatch(lambda *args: self._finish(task, f)))
+        self._executor.shutdown(wait=False)
+
+    def _finish(self, task, future):
+        name, _, apply = task
+        self._apply(name, apply, future)
+        self.done += 1
+        if self.on_progress is not None:
+            self.on_progress(self.done, self.total, name)
+        if self.done == self.total:
+            self.finished = True
+            self._complete()
+
+    def _apply(self, name, apply, future):
+        try:
+            result = future.result()
+            if apply is not None:
+                apply(result)
+        except Exception as e:
+            print(f"Помилка попереднього завантаження {name}: {e}")
+            self.failed.append(name)
+
+    def _complete(self):
+        if self.on_complete is not None:
+            self.on_complete()
@@ -0,0 +1,127 @@
+# Вбудоване профілювання: час обробників, час кадру і затримка від дотику до кадру.
+# Коли профілювання вимкнене, обробники не обгортаються і Clock-подій немає,
+# тож накладні витрати нульові.
+from array import array
+from functools import wraps
+import json
+import time
+
+
+class RingBuffer:
+    def __init__(self, size=1024):
+        self.size = size
+        self.data = array('d', bytes(8 * size))
+        self.index = 0
+        self.count = 0
+        self.total = 0
+
+    def append(self, value):
+        self.data[self.index] = value
+        self.index = (self.index + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+        self.total += 1
+
+    def values(self):
+        if self.count < self.size:
+            return self.data[:self.count]
+        return self.data[self.index:] + self.data[:self.index]
+
+    def summary(self):
+        values = sorted(self.values())
+        if not values:
+            return {'count': 0}
+        n = len(values)
+        return {
+            'count': self.total,
+            'mean': sum(values) / n,
+            'p50': values[n // 2],
+            'p99': values[min(n - 1, int(n * 0.99))],
+            'max': values[-1],
+        }
+
+
+class Profiler:
+    def __init__(self, enabled=False, size=1024, clock=time.perf_counter, frame_budget=1 / 60):
+        self.enabled = enabled
+        self.size = size
+        self.clock = clock
+        self.handlers = {}  # назва -> RingBuffer (секунди)
+        self.frames = RingBuffer(size)
+        self.frame_budget = frame_budget
+        self.dropped_frames = 0  # кадри, що тривали довше за півтора бюджети
+        self.input_latency = RingBuffer(size)
+        self.pending_input = None
+        self.overlay = None
+        self.counters = {}  # назва -> функція, що повертає лічильники підсистеми (кліки, збереження)
+
+    def wrap(self, obj, names):
+        # Підміняє методи екземпляра таймерами; без профілювання нічого не змінює
+        if not self.enabled:
+            return
+        for name in names:
+            setattr(obj, name, self.timed(name, getattr(obj, name)))
+
+    def add_counters(self, name, stats):
+        # Лічильники потрапляють у report() як є; збираються лише в момент звіту
+        self.counters[name] = stats
+
+    def timed(self, name, func):
+        buffer = self.handlers.setdefault(name, RingBuffer(self.size))
+        clock = self.clock
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                buffer.append(clock() - start)
+        return wrapper
+
+    def mark_input(self):
+        if self.pending_input is None:
+            self.pending_input = self.clock()
+
+    def on_frame(self, dt):
+        self.frames.append(dt)
+        if dt > self.frame_budget * 1.5:
+            self.dropped_frames += 1
+
+    def on_flip(self, *args):
+        # Кадр з урахуванням введення вже намальований
+        if self.pending_input is not None:
+            self.input_latency.append(self.clock() - self.pending_input)
+            self.pending_input = None
+
+    def fps(self):
+        summary = self.frames.summary()
+        return 1.0 / summary['mean'] if summary.get('mean') else 0.0
+
+    def overlay_text(self):
+        frames = self.frames.summary()
+        latency = self.input_latency.summary()
+        lines = [f"FPS {self.fps():.0f}"]
+        if frames.get('count'):
+            lines.append(f"кадр p50 {frames['p50'] * 1000:.1f} p99 {frames['p99'] * 1000:.1f} мс")
+        if latency.get('count'):
+            lines.append(f"ввід p50 {latency['p50'] * 1000:.1f} p99 {latency['p99'] * 1000:.1f} мс")
+        for name, buffer in sorted(self.handlers.items()):
+            summary = buffer.summary()
+            if summary.get('count'):
+                lines.append(f"{name} p50 {summary['p50'] * 1e6:.0f} p99 {summary['p99'] * 1e6:.0f} мкс")
+        return "\n".join(lines)
+
+    def report(self):
+        return {
+            'fps': self.fps(),
+            'frame_time': self.frames.summary(),
+            'dropped_frames': self.dropped_frames,
+            'input_latency': self.input_latency.summary(),
+            'handlers': {name: buffer.summary() for name, buffer in self.handlers.items()},
+            'counters': {name: stats() for name, stats in self.counters.items()},
+        }
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
@@ -0,0 +1,145 @@
+# Запис дій гравця у компактний файл і їх відтворення як повторюваного навантажувального тесту.
+#
+# Файл: MAGIC | версія (u16) | довжина знімка (u32) | знімок стану у форматі save.bin,
+# далі записи по 9 байт: пауза від попередньої події (f32, сек) | тип (u8) | аргумент (i32).
+# Знімок потрібен, щоб відтворення починалося з того ж стану, що й запис.
+import struct
+import time
+
+import savefile
+
+TRACE_MAGIC = b'CLKT'
+TRACE_VERSION = 1
+TRACE_HEADER = struct.Struct('<4sHI')
+TRACE_RECORD = struct.Struct('<fBi')
+
+EVENT_CLICK = 1
+EVENT_BUY_SKIN = 2
+EVENT_SELECT_SKIN = 3
+EVENT_BUY_GENERATOR = 4
+EVENT_MUSIC_ON = 5
+EVENT_SOUND_ON = 6
+EVENT_MUSIC_VOLUME = 7  # гучність у тисячних
+EVENT_SOUND_VOLUME = 8
+EVENT_FRENZY = 9  # випадкове шаленство - у записі, бо при відтворенні таймер вимкнений
+
+EVENT_NAMES = {
+    EVENT_CLICK: 'click',
+    EVENT_BUY_SKIN: 'buy_skin',
+    EVENT_SELECT_SKIN: 'select_skin',
+    EVENT_BUY_GENERATOR: 'buy_generator',
+    EVENT_MUSIC_ON: 'music_on',
+    EVENT_SOUND_ON: 'sound_on',
+    EVENT_MUSIC_VOLUME: 'music_volume',
+    EVENT_SOUND_VOLUME: 'sound_volume',
+    EVENT_FRENZY: 'frenzy',
+}
+
+
+class TraceError(Exception):
+    pass
+
+
+class TraceRecorder:
+    def __init__(self, path, sections, clock=time.perf_counter, flush_every=256):
+        self.path = path
+        self.clock = clock
+        self.flush_every = flush_every
+        self.events = 0
+        self._buffer = []
+        self._last = None
+        snapshot = savefile.encode(sections, 0)
+        with open(path, 'wb') as f:
+            f.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, len(snapshot)) + snapshot)
+
+    def record(self, kind, arg=0):
+        now = self.clock()
+        delay = 0.0 if self._last is None else now - self._last
+        self._last = now
+        self._buffer.append(TRACE_RECORD.pack(delay, kind, arg))
+        self.events += 1
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            with open(self.path, 'ab') as f:
+                f.write(b''.join(self._buffer))
+            self._buffer = []
+
+    def close(self):
+        self.flush()
+
+
+def read_trace(path):
+    # Повертає (секції знімка, список (час від початку, тип, аргумент))
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < TRACE_HEADER.size:
+        raise TraceError("файл закороткий")
+    magic, version, snapshot_size = TRACE_HEADER.unpack_from(data)
+    if magic != TRACE_MAGIC or version > TRACE_VERSION:
+        raise TraceError("невідомий формат запису")
+    start = TRACE_HEADER.size + snapshot_size
+    try:
+        _, sections = savefile.decode(data[TRACE_HEADER.size:start])
+    except (savefile.SaveError, struct.error) as e:
+        raise TraceError(f"пошкоджений знімок стану: {e}")
+
+    events = []
+    elapsed = 0.0
+    end = len(data) - (len(data) - start) % TRACE_RECORD.size  # обірваний хвіст відкидаємо
+    for delay, kind, arg in TRACE_RECORD.iter_unpack(data[start:end]):
+        elapsed += delay
+        events.append((elapsed, kind, arg))
+    return sections, events
+
+
+class TraceReplayer:
+    # speed: 1 - реальний час, N - у N разів швидше, 0 - якнайшвидше
+    # (паузи пропускаються, за кадр - скільки подій встигне за frame_budget секунд).
+    # now - час запису, на якому зараз відтворення; ним підміняють годинники
+    # ігрових движків, щоб результат не залежав від швидкості.
+    def __init__(self, events, dispatch, speed=1.0, frame_budget=0.008, clock=time.perf_counter):
+        self.events = events
+        self.dispatch = dispatch
+        self.speed = speed
+        self.frame_budget = frame_budget
+        self.clock = clock
+        self.position = 0
+        self.trace_time = 0.0  # до якого часу запису дійшли кадри (для speed > 0)
+        self.now = 0.0
+        self.frames = 0
+
+    @property
+    def done(self):
+        return self.position >= len(self.events)
+
+    @property
+    def duration(self):
+        return self.events[-1][0] if self.events else 0.0
+
+    def advance(self, dt):
+        # Відтворює події, час яких настав. Повертає кількість відтворених подій.
+        self.frames += 1
+        events = self.events
+        start = self.position
+        if self.speed <= 0:
+            deadline = self.clock() + self.frame_budget
+            while self.position < len(events):
+                self._dispatch_next()
+                if self.clock() >= deadline:
+                    break
+        else:
+            self.trace_time += dt * self.speed
+            while self.position < len(events) and events[self.position][0] <= self.trace_time:
+                self._dispatch_next()
+            self.now = self.duration if self.done else self.trace_time
+        return self.position - start
+
+    def _dispatch_next(self):
+        t, kind, arg = self.events[self.position]
+        self.now = t
+        self.position += 1
+        self.dispatch(kind, arg)
+
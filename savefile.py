@@ -0,0 +1,98 @@
+# Двійковий формат збереження з версією та контрольною сумою.
+#
+# Файл: заголовок MAGIC | версія (u16) | номер запису (u32) | довжина (u32) | crc32 (u32),
+# далі секції: тег (2 байти) | довжина (u32) | дані.
+# Запис по черзі йде у два слоти (save.bin і save.bin.1), тому якщо останній
+# запис обірвався, при завантаженні береться попередній цілий слот.
+import os
+import struct
+import zlib
+
+from persistence import atomic_write
+
+MAGIC = b'CLKS'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHIII')
+SECTION = struct.Struct('<2sI')
+
+
+class SaveError(Exception):
+    pass
+
+
+def encode(sections, sequence):
+    payload = b''.join(SECTION.pack(tag, len(data)) + data for tag, data in sections.items())
+    return HEADER.pack(MAGIC, FORMAT_VERSION, sequence, len(payload), zlib.crc32(payload)) + payload
+
+
+def decode(blob):
+    if len(blob) < HEADER.size:
+        raise SaveError("файл закороткий")
+    magic, version, sequence, length, crc = HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise SaveError("невідомий формат")
+    if version > FORMAT_VERSION:
+        raise SaveError(f"непідтримувана версія {version}")
+    payload = blob[HEADER.size:HEADER.size + length]
+    if len(payload) != length or zlib.crc32(payload) != crc:
+        raise SaveError("пошкоджені дані")
+
+    sections = {}
+    offset = 0
+    while offset < length:
+        tag, size = SECTION.unpack_from(payload, offset)
+        offset += SECTION.size
+        sections[tag] = payload[offset:offset + size]
+        offset += size
+    return sequence, sections
+
+
+class SaveFile:
+    def __init__(self, path, slots=2, fsync=False):
+        self.path = path
+        self.slots = slots
+        self.fsync = fsync
+        self.sequence = 0
+
+    def slot_path(self, slot):
+        return self.path if slot == 0 else f"{self.path}.{slot}"
+
+    def exists(self):
+        return any(os.path.exists(self.slot_path(slot)) for slot in range(self.slots))
+
+    def read(self):
+        # Повертає секції найновішого цілого слоту або None, якщо цілих слотів немає
+        best = None
+        for slot in range(self.slots):
+            try:
+                with open(self.slot_path(slot), 'rb') as f:
+                    sequence, sections = decode(f.read())
+            except FileNotFoundError:
+                continue
+            except (OSError, SaveError, struct.error) as e:
+                print(f"Пропускаємо пошкоджений слот {self.slot_path(slot)}: {e}")
+                continue
+            if best is None or sequence > best[0]:
+                best = (sequence, sections)
+
+        if best is None:
+            return None
+        self.sequence = best[0]
+        return best[1]
+
+    def write(self, sections):
+        self.sequence += 1
+        slot = self.sequence % self.slots
+        atomic_write(self.slot_path(slot), encode(sections, self.sequence), self.fsync)
+
+
+def pack_int(value):
+    # Ціле довільної довжини: u16 довжина + байти зі знаком
+    data = value.to_bytes((value.bit_length() + 8) // 8, 'little', signed=True)
+    return struct.pack('<H', len(data)) + data
+
+
+def unpack_int(data, offset=0):
+    (size,) = struct.unpack_from('<H', data, offset)
+    offset += 2
+    return int.from_bytes(data[offset:offset + size], 'little', signed=True), offset + size
@@ -0,0 +1,214 @@
+# Віджети магазину. Модуль імпортується лише при першому відкритті магазину,
+# щоб RecycleView, ToggleButton та інше не сповільнювали холодний старт.
+from kivy.app import App
+from kivy.metrics import dp
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.image import Image
+from kivy.uix.label import Label
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.togglebutton import ToggleButton
+from kivy.utils import get_color_from_hex
+
+from bignum import format_compact
+from catalog import SHOP_IMAGE_DP
+
+SHOP_IMAGE_SIZE = (dp(SHOP_IMAGE_DP[0]), dp(SHOP_IMAGE_DP[1]))  # розмір фото на картці магазину
+
+
+class ShopItem(RecycleDataViewBehavior, BoxLayout):
+    # Картка магазину. Створюється RecycleView лише для видимих позицій і перевикористовується.
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.orientation = 'vertical'
+        self.size_hint = (None, None)
+        self.size = (dp(300), dp(400))
+        self.spacing = dp(10)
+        self.padding = dp(10)
+        self.app = App.get_running_app()
+        self.skin_index = 0
+        self.price = 0
+        self.purchased = False
+        self.image_source = ''
+
+        self.image = Image(
+            size_hint=(1, 0.7),
+            allow_stretch=True,
+            keep_ratio=False
+        )
+
+        self.price_label = Label(
+            size_hint=(1, 0.1),
+            font_size=dp(20),
+            bold=True
+        )
+
+        self.buy_button = Button(
+            size_hint=(1, 0.1),
+            background_normal='',
+            on_press=self.buy_item
+        )
+
+        self.select_button = ToggleButton(
+            size_hint=(1, 0.1),
+            background_color=get_color_from_hex('#42a1f5'),
+            background_normal='',
+            group='skins',
+            on_press=self.select_skin
+        )
+
+        self.add_widget(self.image)
+        self.add_widget(self.price_label)
+        self.add_widget(self.buy_button)
+        self.add_widget(self.select_button)
+
+    def refresh_view_attrs(self, rv, index, data):
+        item = self.app.catalog[data['skin_index']]
+        self.price = item.price
+        self.image_source = item.image
+        # Зменшена копія з кешу замість декодування повного PNG
+        self.image.texture = self.app.assets.texture(item.image, *SHOP_IMAGE_SIZE)
+
+        if item.index == 0:
+            self.price_label.text = "БЕЗЦІННО!"
+        else:
+            self.price_label.text = "БЕЗКОШТОВНО!" if item.price == 0 else f"{format_compact(item.price)} монет"
+
+        super().refresh_view_attrs(rv, index, data)
+        rv.track_view(self)
+        self.refresh_state()
+
+    def refresh_state(self):
+        # Стан покупки і вибору беремо з пам'яті, а не з файлу
+        skin_index = self.skin_index
+        price = self.price
+        self.purchased = self.app.state.is_purchased(skin_index) or price == 0
+
+        if skin_index == 0:
+            btn_text = "Не можна отримати"
+            btn_disabled = True
+            btn_color = '#cccccc'
+        else:
+            btn_text = "Отримати" if price == 0 else ("Куплено" if self.purchased else "Купити")
+            btn_disabled = self.purchased
+            btn_color = '#42a1f5' if price == 0 else ('#cccccc' if self.purchased else '#42f554')
+
+        self.buy_button.text = btn_text
+        self.buy_button.disabled = btn_disabled
+        self.buy_button.background_color = get_color_from_hex(btn_color)
+
+        selected = self.app.state.current_skin == skin_index
+        self.select_button.text = "Обрано" if selected else "Обрати"
+        self.select_button.state = 'down' if selected else 'normal'
+        self.select_button.disabled = not self.purchased or skin_index == 0
+
+    def buy_item(self, instance):
+        if self.app.buy_skin(self.skin_index):
+            # Картка оновиться через прив'язку до current_skin; якщо скін уже був обраний - оновлюємо тут
+            self.refresh_state()
+
+    def select_skin(self, instance):
+        if instance.state != 'down' or not self.app.select_skin(self.skin_index):
+            self.refresh_state()
+
+
+class GeneratorItem(RecycleDataViewBehavior, BoxLayout):
+    # Картка генератора пасивного доходу
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.orientation = 'vertical'
+        self.size_hint = (None, None)
+        self.size = (dp(300), dp(400))
+        self.spacing = dp(10)
+        self.padding = dp(10)
+        self.app = App.get_running_app()
+        self.generator_id = 0
+
+        self.name_label = Label(
+            size_hint=(1, 0.5),
+            font_size=dp(28),
+            bold=True
+        )
+
+        self.rate_label = Label(
+            size_hint=(1, 0.15),
+            font_size=dp(20),
+            color=get_color_from_hex('#42f554')
+        )
+
+        self.count_label = Label(
+            size_hint=(1, 0.15),
+            font_size=dp(20)
+        )
+
+        self.buy_button = Button(
+            size_hint=(1, 0.2),
+            background_color=get_color_from_hex('#42f554'),
+            background_normal='',
+            on_press=self.buy_item
+        )
+
+        self.add_widget(self.name_label)
+        self.add_widget(self.rate_label)
+        self.add_widget(self.count_label)
+        self.add_widget(self.buy_button)
+
+    def refresh_view_attrs(self, rv, index, data):
+        generator = self.app.engine.income.generators[data['generator_id']]
+        self.name_label.text = generator.name
+        self.rate_label.text = f"+{generator.rate:g} монет/сек"
+        super().refresh_view_attrs(rv, index, data)
+        self.refresh_state()
+
+    def refresh_state(self):
+        income = self.app.engine.income
+        self.count_label.text = f"Є: {income.count(self.generator_id)}"
+        self.buy_button.text = f"Купити за {format_compact(income.price(self.generator_id))}"
+
+    def buy_item(self, instance):
+        if self.app.buy_generator(self.generator_id):
+            self.refresh_state()
+
+
+class ShopRecycleView(RecycleView):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.size_hint = (1, 1)
+        self.do_scroll_x = True
+        self.do_scroll_y = False
+        self.bar_width = dp(10)
+
+        # viewclass передається менеджеру розкладки, тож його задаємо лише після add_widget;
+        # key_viewclass дозволяє генераторам у тих же даних мати власну картку
+        self.items_layout = RecycleBoxLayout(
+            orientation='horizontal',
+            key_viewclass='viewclass',
+            size_hint=(None, 1),
+            default_size=(dp(300), dp(400)),
+            default_size_hint=(None, None),
+            spacing=dp(20),
+            padding=dp(20)
+        )
+        self.items_layout.bind(minimum_width=self.items_layout.setter('width'))
+        self.add_widget(self.items_layout)
+        self.viewclass = ShopItem
+
+        self.views_by_skin = {}  # skin_index -> видима картка
+
+    def set_catalog(self, catalog, generators=()):
+        self.data = [{'viewclass': 'ShopItem', 'skin_index': item.index} for item in catalog] + \
+                    [{'viewclass': 'GeneratorItem', 'generator_id': g.id} for g in generators]
+
+    def track_view(self, view):
+        # Картку перевикористали для іншого скіна - прибираємо старий запис
+        for skin_index, tracked in list(self.views_by_skin.items()):
+            if tracked is view and skin_index != view.skin_index:
+                del self.views_by_skin[skin_index]
+        self.views_by_skin[view.skin_index] = view
+
+    def refresh_card(self, skin_index):
+        view = self.views_by_skin.get(skin_index)
+        if view is not None and view.skin_index == skin_index:
+            view.refresh_state()
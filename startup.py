@@ -0,0 +1,81 @@
+# Швидкий старт: прапорці командного рядка і журнал етапів запуску.
+# Імпортується раніше за Kivy, тому сам Kivy тут не використовується.
+import json
+import os
+import time
+
+SPLASH_MODES = ('full', 'short', 'off')
+
+# --no-splash, --short-splash або змінна середовища CLICKER_SPLASH=off|short|full
+SPLASH_FLAGS = {
+    '--no-splash': 'off',
+    '--fast-start': 'off',
+    '--short-splash': 'short',
+}
+
+
+# Прапорці зі значенням: --record PATH, --replay PATH, --replay-speed X, --leaderboard HOST:PORT
+VALUE_FLAGS = ('--record', '--replay', '--replay-speed', '--leaderboard')
+
+
+def parse_startup_args(argv, environ=os.environ):
+    # Прибирає наші прапорці з argv, щоб їх не намагався розібрати Kivy
+    splash = environ.get('CLICKER_SPLASH', 'full')
+    profile = environ.get('CLICKER_PROFILE', '') not in ('', '0')
+    values = {}
+    rest = []
+    args = iter(argv)
+    for arg in args:
+        if arg in SPLASH_FLAGS:
+            splash = SPLASH_FLAGS[arg]
+        elif arg == '--profile':
+            profile = True
+        elif arg in VALUE_FLAGS:
+            values[arg] = next(args, None)
+        else:
+            rest.append(arg)
+    argv[:] = rest
+    if splash not in SPLASH_MODES:
+        splash = 'full'
+
+    try:
+        replay_speed = float(values.get('--replay-speed') or 1.0)
+    except ValueError:
+        print(f"Неправильна швидкість відтворення: {values['--replay-speed']}")
+        replay_speed = 1.0
+    replay = values.get('--replay')
+    if replay:
+        # Відтворення - це навантажувальний тест: без заставки і з профілюванням
+        splash = 'off'
+        profile = True
+    return {'splash': splash, 'profile': profile, 'record': values.get('--record'),
+            'replay': replay, 'replay_speed': replay_speed,
+            'leaderboard': values.get('--leaderboard') or environ.get('CLICKER_LEADERBOARD')}
+
+
+class StartupTimeline:
+    def __init__(self, start=None, clock=time.perf_counter):
+        self.clock = clock
+        self.start = start if start is not None else clock()
+        self.marks = []
+
+    def mark(self, name):
+        if not any(mark == name for mark, _ in self.marks):
+            self.marks.append((name, self.clock() - self.start))
+
+    def elapsed(self, name):
+        for mark, seconds in self.marks:
+            if mark == name:
+                return seconds
+        return None
+
+    def write(self, path, **extra):
+        # Один рядок JSON на запуск, щоб бачити регресії між запусками
+        record = {'time': time.time()}
+        record.update(extra)
+        record.update({name: round(seconds, 4) for name, seconds in self.marks})
+        try:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + '\n')
+        except OSError as e:
+            print(f"Помилка запису журналу запуску: {e}")
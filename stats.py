@@ -0,0 +1,278 @@
+# Статистика гравця і досягнення.
+# Пам'ять фіксована: лічильники - список сталої довжини, вікно темпу кліків - кільце
+# посекундних кошиків, історія і гістограма хвилин - масиви, виділені один раз.
+# Для кожного лічильника зберігається лише найближчий поріг досягнення, тож
+# перевірка на клік - одне порівняння, без обходу всіх досягнень.
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+import json
+import struct
+import time
+
+from savefile import pack_int, unpack_int
+
+STAT_CLICKS = 0
+STAT_COINS_EARNED = 1  # монети, зароблені кліками
+STAT_COINS_SPENT = 2
+STAT_PEAK_CPS = 3  # найбільше кліків за одну секунду
+STAT_PLAY_SECONDS = 4
+STAT_SKINS_BOUGHT = 5
+STAT_GENERATORS_BOUGHT = 6
+
+STAT_NAMES = ('clicks', 'coins_earned', 'coins_spent', 'peak_cps', 'play_seconds', 'skins_bought',
+              'generators_bought')
+
+Achievement = namedtuple('Achievement', 'id name stat threshold')
+
+# id - номер біта в масці відкритих досягнень
+DEFAULT_ACHIEVEMENTS = (
+    Achievement(0, "Перший клік", STAT_CLICKS, 1),
+    Achievement(1, "Сотня кліків", STAT_CLICKS, 100),
+    Achievement(2, "Тисяча кліків", STAT_CLICKS, 1000),
+    Achievement(3, "Сто тисяч кліків", STAT_CLICKS, 100000),
+    Achievement(4, "Швидкі пальці", STAT_PEAK_CPS, 10),
+    Achievement(5, "Кулемет", STAT_PEAK_CPS, 20),
+    Achievement(6, "Модник", STAT_SKINS_BOUGHT, 1),
+    Achievement(7, "Колекціонер", STAT_SKINS_BOUGHT, 3),
+    Achievement(8, "Інвестор", STAT_GENERATORS_BOUGHT, 1),
+    Achievement(9, "Мільйонер", STAT_COINS_EARNED, 1000000),
+    Achievement(10, "Марнотрат", STAT_COINS_SPENT, 100000),
+    Achievement(11, "Година гри", STAT_PLAY_SECONDS, 3600),
+)
+
+# Межі кошиків гістограми кліків за хвилину: [0, 10), [10, 30), ..., [2000, ...)
+MINUTE_BINS = (10, 30, 60, 120, 240, 480, 1000, 2000)
+MAX_TICK_SECONDS = 5  # довші паузи між тіками (сон, фон) не рахуються як час гри
+
+STATS_HEADER = struct.Struct('<BHBH')  # лічильники, хвилин в історії, кошиків, слотів скінів
+
+
+def load_achievements(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return tuple(Achievement(int(a['id']), a['name'], STAT_NAMES.index(a['stat']), int(a['threshold']))
+                     for a in data['achievements'])
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"Помилка завантаження досягнень: {e}")
+        return DEFAULT_ACHIEVEMENTS
+
+
+class StatsEngine:
+    def __init__(self, achievements=DEFAULT_ACHIEVEMENTS, skin_slots=64, window=60, minutes=60,
+                 clock=time.monotonic):
+        self.achievements = {a.id: a for a in achievements}
+        self.clock = clock
+        self.on_unlock = None  # викликається з досягненням, щойно воно відкрилося
+
+        # Для кожного лічильника - його досягнення, відсортовані за порогом
+        self.by_stat = [[] for _ in STAT_NAMES]
+        for a in sorted(achievements, key=lambda a: a.threshold):
+            self.by_stat[a.stat].append(a)
+
+        self.values = [0] * len(STAT_NAMES)
+        self.skin_spent = [0] * skin_slots
+        self.unlocked = 0  # бітова маска id
+        self.next_index = [0] * len(STAT_NAMES)
+        self.next_threshold = [float('inf')] * len(STAT_NAMES)
+
+        self.seconds = array('I', bytes(4 * window))  # кліки по секундах за останні window сек
+        self.window_clicks = 0
+        self.second = None  # ціла секунда поточного кошика
+        self.second_pos = 0
+
+        self.minutes = array('I', bytes(4 * minutes))  # кліки по хвилинах, по колу
+        self.minute_pos = 0
+        self.minute_clicks = 0
+        self.minute_start = None
+        self.histogram = array('I', bytes(4 * (len(MINUTE_BINS) + 1)))
+
+        self.play_carry = 0.0
+        self.last_tick = None
+        self._reindex()
+
+    def reset(self):
+        for i in range(len(self.values)):
+            self.values[i] = 0
+        for i in range(len(self.skin_spent)):
+            self.skin_spent[i] = 0
+        for buffer in (self.seconds, self.minutes, self.histogram):
+            for i in range(len(buffer)):
+                buffer[i] = 0
+        self.unlocked = 0
+        self.window_clicks = 0
+        self.minute_pos = 0
+        self.minute_clicks = 0
+        self.second = self.minute_start = self.last_tick = None
+        self.play_carry = 0.0
+        self._reindex()
+
+    def is_unlocked(self, achievement_id):
+        return bool(self.unlocked >> achievement_id & 1)
+
+    def add(self, stat, amount=1):
+        value = self.values[stat] + amount
+        self.values[stat] = value
+        if value >= self.next_threshold[stat]:
+            self._unlock(stat)
+
+    def set_max(self, stat, value):
+        if value > self.values[stat]:
+            self.values[stat] = value
+            if value >= self.next_threshold[stat]:
+                self._unlock(stat)
+
+    def add_clicks(self, count, coins=0, now=None):
+        # Пакет кліків одного кадру: лічильники, темп і пік за секунду
+        if now is None:
+            now = self.clock()
+        second = int(now)
+        if second != self.second:
+            self._advance(second)
+        pos = self.second_pos
+        in_second = self.seconds[pos] + count
+        self.seconds[pos] = in_second
+        self.window_clicks += count
+        self.minute_clicks += count
+
+        self.add(STAT_CLICKS, count)
+        if coins:
+            self.add(STAT_COINS_EARNED, coins)
+        self.set_max(STAT_PEAK_CPS, in_second)
+
+    def clicks_per_minute(self):
+        # Кліки за останні window секунд (за замовчуванням - хвилина)
+        return self.window_clicks
+
+    def buy_skin(self, skin_index, price):
+        if 0 <= skin_index < len(self.skin_spent):
+            self.skin_spent[skin_index] += price
+        self.add(STAT_COINS_SPENT, price)
+        self.add(STAT_SKINS_BOUGHT)
+
+    def buy_generator(self, price):
+        self.add(STAT_COINS_SPENT, price)
+        self.add(STAT_GENERATORS_BOUGHT)
+
+    def tick(self, now=None):
+        # Раз на секунду: час гри і закриття хвилин навіть без кліків
+        if now is None:
+            now = self.clock()
+        if self.last_tick is not None:
+            elapsed = self.play_carry + min(max(0.0, now - self.last_tick), MAX_TICK_SECONDS)
+            whole = int(elapsed)
+            self.play_carry = elapsed - whole
+            if whole:
+                self.add(STAT_PLAY_SECONDS, whole)
+        self.last_tick = now
+        second = int(now)
+        if second != self.second:
+            self._advance(second)
+
+    def resume(self):
+        # Після паузи: час у фоні не рахується
+        self.last_tick = None
+
+    def _advance(self, second):
+        if self.second is not None:
+            # Обнуляємо кошики пропущених секунд; не більше довжини вікна
+            window = len(self.seconds)
+            for _ in range(min(second - self.second, window)):
+                self.second_pos = (self.second_pos + 1) % window
+                self.window_clicks -= self.seconds[self.second_pos]
+                self.seconds[self.second_pos] = 0
+        self.second = second
+
+        if self.minute_start is None:
+            self.minute_start = second
+        elif second - self.minute_start >= 60:
+            self._close_minute()
+            self.minute_start = second
+
+    def _close_minute(self):
+        clicks = self.minute_clicks
+        self.minute_clicks = 0
+        self.minutes[self.minute_pos % len(self.minutes)] = clicks
+        self.minute_pos += 1
+        if clicks:  # хвилини без кліків (гра у фоні) гістограму не розмивають
+            self.histogram[bisect_right(MINUTE_BINS, clicks)] += 1
+
+    def recent_minutes(self):
+        # Кліки за останні хвилини, від найстарішої
+        size = len(self.minutes)
+        count = min(self.minute_pos, size)
+        return [self.minutes[(self.minute_pos - count + i) % size] for i in range(count)]
+
+    def _unlock(self, stat):
+        value = self.values[stat]
+        pending = self.by_stat[stat]
+        i = self.next_index[stat]
+        while i < len(pending) and pending[i].threshold <= value:
+            achievement = pending[i]
+            i += 1
+            if not self.is_unlocked(achievement.id):
+                self.unlocked |= 1 << achievement.id
+                if self.on_unlock is not None:
+                    self.on_unlock(achievement)
+        self.next_index[stat] = i
+        self.next_threshold[stat] = pending[i].threshold if i < len(pending) else float('inf')
+
+    def _reindex(self):
+        # Після завантаження: пропускаємо вже відкриті досягнення без сповіщень
+        for stat, pending in enumerate(self.by_stat):
+            i = 0
+            while i < len(pending) and (self.is_unlocked(pending[i].id) or pending[i].threshold <= self.values[stat]):
+                self.unlocked |= 1 << pending[i].id
+                i += 1
+            self.next_index[stat] = i
+            self.next_threshold[stat] = pending[i].threshold if i < len(pending) else float('inf')
+
+    def summary(self):
+        result = {name: self.values[stat] for stat, name in enumerate(STAT_NAMES)}
+        result['clicks_per_minute'] = self.clicks_per_minute()
+        result['recent_minutes'] = self.recent_minutes()
+        result['minute_histogram'] = list(self.histogram)
+        result['skin_spent'] = {i: spent for i, spent in enumerate(self.skin_spent) if spent}
+        result['achievements'] = [a.name for a in self.achievements.values() if self.is_unlocked(a.id)]
+        return result
+
+    def to_bytes(self):
+        # Розмір сталий: не залежить від тривалості гри
+        minutes = self.recent_minutes()
+        return b''.join([
+            STATS_HEADER.pack(len(self.values), len(minutes), len(self.histogram), len(self.skin_spent)),
+            b''.join(pack_int(value) for value in self.values),
+            struct.pack(f'<{len(minutes)}I', *minutes),
+            struct.pack(f'<{len(self.histogram)}I', *self.histogram),
+            b''.join(pack_int(spent) for spent in self.skin_spent),
+            pack_int(self.unlocked),
+        ])
+
+    def load_bytes(self, data):
+        self.reset()
+        stat_count, minute_count, bin_count, skin_count = STATS_HEADER.unpack_from(data)
+        offset = STATS_HEADER.size
+        for stat in range(stat_count):
+            value, offset = unpack_int(data, offset)
+            if stat < len(self.values):
+                self.values[stat] = value
+
+        minutes = struct.unpack_from(f'<{minute_count}I', data, offset)
+        offset += 4 * minute_count
+        for clicks in minutes[-len(self.minutes):]:
+            self.minutes[self.minute_pos % len(self.minutes)] = clicks
+            self.minute_pos += 1
+
+        bins = struct.unpack_from(f'<{bin_count}I', data, offset)
+        offset += 4 * bin_count
+        for i, count in enumerate(bins[:len(self.histogram)]):
+            self.histogram[i] = count
+
+        for i in range(skin_count):
+            spent, offset = unpack_int(data, offset)
+            if i < len(self.skin_spent):
+                self.skin_spent[i] = spent
+
+        self.unlocked, offset = unpack_int(data, offset)
+        self._reindex()
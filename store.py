@@ -0,0 +1,38 @@
+# Спостережуване дзеркало GameState на властивостях Kivy.
+# Віджети прив'язуються до потрібних полів і оновлюються лише тоді,
+# коли значення справді змінилося (Kivy не розсилає подію при тому ж значенні).
+from kivy.event import EventDispatcher
+from kivy.properties import BooleanProperty, NumericProperty, ObjectProperty
+
+STORE_FIELDS = (
+    'coins',
+    'multiplier',
+    'upgrade_level',
+    'current_skin',
+    'purchased_mask',
+    'music_on',
+    'sound_on',
+    'music_volume',
+    'sound_volume',
+)
+
+
+class GameStore(EventDispatcher):
+    coins = ObjectProperty(0)  # ціле довільної довжини
+    multiplier = NumericProperty(1)
+    upgrade_level = NumericProperty(0)
+    current_skin = NumericProperty(0)
+    purchased_mask = ObjectProperty(1)
+    music_on = BooleanProperty(True)
+    sound_on = BooleanProperty(True)
+    music_volume = NumericProperty(0.5)
+    sound_volume = NumericProperty(1.0)
+    income_rate = NumericProperty(0)  # монет за секунду від генераторів
+    boost_factor = NumericProperty(1)  # добуток активних бустів
+
+    def sync(self, engine):
+        state = engine.state
+        for name in STORE_FIELDS:
+            setattr(self, name, getattr(state, name))
+        self.income_rate = engine.income.rate
+        self.boost_factor = engine.boosts.factor
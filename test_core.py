@@ -0,0 +1,184 @@
+# Тести ігрової логіки без Kivy: python -m pytest
+import random
+
+import pytest
+
+from bignum import CompactDisplay, compact_bounds, format_compact
+from boosts import BOOST_COMBO, BOOST_FRENZY, BoostScheduler
+from game_state import GameEngine
+from savefile import SaveFile
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def play(clicks, batches, factor=1):
+    # Ті самі кліки пакетами заданих розмірів
+    engine = GameEngine()
+    if factor > 1:
+        engine.boosts.add(factor, 1e9)
+    for batch in batches:
+        engine.click(batch)
+    assert sum(batches) == clicks
+    s = engine.state
+    return s.coins, s.upgrade_level, s.multiplier
+
+
+@pytest.mark.parametrize('factor', [1, 2, 3])
+def test_batch_matches_single_clicks_across_tiers(factor):
+    # 6000 кліків проходять усі три пороги (250, 1000, 10000) за будь-якого буста
+    clicks = 6000
+    single = play(clicks, [1] * clicks, factor)
+    assert single[1] == 3
+
+    assert play(clicks, [clicks], factor) == single
+    rng = random.Random(factor)
+    batches = []
+    left = clicks
+    while left:
+        batch = min(left, rng.randint(1, 400))
+        batches.append(batch)
+        left -= batch
+    assert play(clicks, batches, factor) == single
+
+
+def test_batch_landing_exactly_on_threshold():
+    # Клік, що досягає порогу, ще йде за старим множником - і пакетом, і поодинці
+    assert play(250, [250]) == play(250, [1] * 250) == (250, 1, 2)
+    assert play(251, [251]) == play(251, [1] * 251) == (252, 1, 2)
+
+
+def test_savefile_falls_back_to_intact_slot(tmp_path):
+    path = str(tmp_path / 'save.bin')
+    save = SaveFile(path)
+    save.write({b'ST': b'first'})
+    save.write({b'ST': b'second'})
+
+    assert SaveFile(path).read() == {b'ST': b'second'}
+
+    # Обірваний запис найновішого слоту - береться попередній
+    newest = save.slot_path(save.sequence % save.slots)
+    with open(newest, 'rb') as f:
+        data = f.read()
+    with open(newest, 'wb') as f:
+        f.write(data[:-3])
+    loaded = SaveFile(path)
+    assert loaded.read() == {b'ST': b'first'}
+    assert loaded.sequence == 1
+
+    # Наступний запис після відкату йде у пошкоджений слот, а не затирає цілий
+    loaded.write({b'ST': b'third'})
+    assert SaveFile(path).read() == {b'ST': b'third'}
+
+
+def test_savefile_all_slots_corrupt(tmp_path):
+    save = SaveFile(str(tmp_path / 'save.bin'))
+    assert save.read() is None and not save.exists()
+    for slot in range(save.slots):
+        with open(save.slot_path(slot), 'wb') as f:
+            f.write(b'CLKS garbage')
+    assert save.read() is None
+    assert save.exists()
+
+
+@pytest.mark.parametrize('value, text', [
+    (0, '0'), (999, '999'), (1000, '1K'), (1234, '1.2K'), (999999, '999.9K'),
+    (1000000, '1M'), (5600000000, '5.6B'), (7.8e12, '7.8T'), (5 * 10 ** 30, '5.0e30'), (-1500, '-1.5K'),
+])
+def test_compact_text(value, text):
+    assert compact_bounds(value)[0] == text
+
+
+def test_compact_bounds_cover_exactly_same_text():
+    for value in [0, 7, 999, 1000, 1099, 1100, 123456, 10 ** 9 + 1, 10 ** 15, 987 * 10 ** 20, -1, -1000, -123456]:
+        text, low, high = compact_bounds(value)
+        assert low <= value < high
+        assert compact_bounds(low)[0] == text
+        assert compact_bounds(high - 1)[0] == text
+        assert compact_bounds(low - 1)[0] != text
+        assert compact_bounds(high)[0] != text
+
+
+def test_compact_display_skips_unchanged_text():
+    display = CompactDisplay()
+    assert display.update(1200) == '1.2K'
+    assert display.update(1250) is None
+    assert display.skipped == 1
+    assert display.update(1300) == '1.3K'
+    assert format_compact(0.5) == '0.5'
+
+
+def test_boosts_survive_save_and_load():
+    clock = FakeClock(100.0)
+    boosts = BoostScheduler(clock=clock)
+    boosts.add(2, 5, BOOST_COMBO)
+    boosts.add(3, 15, BOOST_FRENZY)
+    assert boosts.factor == 6
+    clock.now = 102.0
+    data = boosts.to_bytes()
+
+    # Час закритої гри не рахується: залишок відлічується від моменту завантаження
+    later = FakeClock(5000.0)
+    loaded = BoostScheduler(clock=later)
+    loaded.load_bytes(data)
+    assert loaded.factor == 6
+    assert loaded.is_active(BOOST_COMBO) and loaded.is_active(BOOST_FRENZY)
+    assert loaded.time_left() == pytest.approx(3.0)
+
+    later.now = 5003.0
+    assert loaded.expire()
+    assert loaded.factor == 3
+    assert not loaded.is_active(BOOST_COMBO)
+    later.now = 5013.0
+    assert loaded.expire()
+    assert loaded.factor == 1 and len(loaded) == 0 and loaded.time_left() is None
+
+
+def test_expired_boosts_are_not_saved():
+    clock = FakeClock()
+    boosts = BoostScheduler(clock=clock)
+    boosts.add(2, 1, BOOST_COMBO)
+    clock.now = 5.0
+    loaded = BoostScheduler(clock=clock)
+    loaded.load_bytes(boosts.to_bytes())
+    assert loaded.factor == 1 and len(loaded) == 0
+
+
+def test_notifications_collapse_and_cooldown():
+    NotificationQueue = pytest.importorskip('notifications').NotificationQueue
+    clock = FakeClock()
+    queue = NotificationQueue(max_size=2, cooldown=1.0, clock=clock)
+
+    for _ in range(3):
+        queue.push("Комбо!")
+    queue.push("Шаленство!")
+    assert queue.collapsed == 2
+    assert len(queue.pending) == 2
+
+    current = queue.next()
+    assert queue.display_text(current) == "Комбо! ×3"
+    # Той самий текст, поки він на екрані, лише збільшує лічильник показу
+    assert queue.push("Комбо!") is True
+    assert queue.display_text(queue.current) == "Комбо! ×4"
+
+    assert queue.display_text(queue.next()) == "Шаленство!"
+    assert queue.push("Комбо!") is False
+    assert queue.suppressed == 1  # щойно показане повторюється не раніше cooldown
+    clock.now = 2.0
+    queue.push("Комбо!")
+    assert len(queue.pending) == 1
+
+
+def test_notification_queue_is_bounded():
+    NotificationQueue = pytest.importorskip('notifications').NotificationQueue
+    queue = NotificationQueue(max_size=2, clock=FakeClock())
+    for text in ("a", "b", "b", "c"):
+        queue.push(text)
+    # Найстаріше "a" витіснене; "b" зберегло свій лічильник
+    assert [entry[:] for entry in queue.pending] == [["b", 2], ["c", 1]]
+    assert queue.suppressed == 1
@@ -0,0 +1,84 @@
+# Магазин у справжньому ClickerApp без дисплея (вікно SDL offscreen, як у bench.py)
+import os
+import shutil
+import time
+
+import pytest
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+os.environ.setdefault('SDL_VIDEODRIVER', 'offscreen')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('CLICKER_SPLASH', 'off')
+pytest.importorskip('kivy')
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ASSETS = ('item1.png', 'item2.png', 'item3.png', 'item4.png', 'splash.png', 'click.mp3',
+          'upgrades.json', 'catalog.json')
+
+
+@pytest.fixture(scope='module')
+def app(tmp_path_factory):
+    # Застосунок пише save.bin і кеші в поточну теку - працюємо в тимчасовій
+    workdir = tmp_path_factory.mktemp('clicker')
+    for name in ASSETS:
+        shutil.copy(os.path.join(ROOT, name), workdir)
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        import main
+        from kivy.base import EventLoop
+        app = main.ClickerApp()
+        app._run_prepare()
+        deadline = time.monotonic() + 10
+        while not app.preloader.finished and time.monotonic() < deadline:
+            EventLoop.idle()
+        yield app
+        app.saver.stop()
+    finally:
+        os.chdir(cwd)
+
+
+def idle(frames=3):
+    from kivy.base import EventLoop
+    for _ in range(frames):
+        EventLoop.idle()
+
+
+def test_shop_builds_cards(app):
+    app.show_shop(None)
+    idle()
+    view = app.shop_view
+    cards = view.layout_manager.children
+    assert cards
+    assert {type(card).__name__ for card in cards} == {'ShopItem'}
+    assert set(view.views_by_skin) == {card.skin_index for card in cards}
+
+    # Генератори - свої картки в тих же даних
+    view.scroll_x = 1
+    idle()
+    assert 'GeneratorItem' in {type(card).__name__ for card in view.layout_manager.children}
+    view.scroll_x = 0
+    idle()
+    app.shop_popup.dismiss(animation=False)
+
+
+def test_purchase_refreshes_card(app):
+    app.state.coins = 10 ** 6
+    app.commit_state()
+    app.show_shop(None)
+    idle()
+    card = app.shop_view.views_by_skin[1]
+    assert card.buy_button.text == "Купити"
+
+    card.buy_item(card.buy_button)
+    idle()
+    assert app.state.current_skin == 1
+    assert card.buy_button.text == "Куплено"
+    assert card.select_button.text == "Обрано"
+
+    # Вибір іншого скіна оновлює обидві картки
+    app.select_skin(0)
+    idle()
+    assert card.select_button.text == "Обрати"
+    app.shop_popup.dismiss(animation=False)